@@ -1,11 +1,12 @@
 from flask import Flask
 from flask_login import LoginManager
 from flask_moment import Moment
-from firebase_admin import credentials, initialize_app, firestore, storage, db as rtdb
 import os
 from dotenv import load_dotenv
 import logging
 from .utils.warning_filters import setup_warning_filters
+from .utils.firebase_clients import firebase
+from .utils.json_provider import FastJSONProvider
 
 # Set up warning filters at app startup
 setup_warning_filters()
@@ -14,52 +15,6 @@ setup_warning_filters()
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Initialize Firebase Admin SDK
-try:
-    # Clean up existing apps
-    logger.debug("Initializing Firebase apps...")
-    try:
-        import firebase_admin
-        for app in firebase_admin._apps.values():
-            firebase_admin.delete_app(app)
-        logger.debug("Cleaned up existing Firebase apps")
-    except Exception as e:
-        logger.debug(f"No existing apps to clean up: {str(e)}")
-
-    # Initialize main Firebase app
-    main_cred_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                'firebase', 'innofund-firebase-admin.json')
-    logger.debug(f"Main Firebase credentials path: {main_cred_path}")
-    
-    default_app = initialize_app(credentials.Certificate(main_cred_path), {
-        'databaseURL': os.getenv('FIREBASE_DATABASE_URL', 'https://innofund-own-default-rtdb.asia-southeast1.firebasedatabase.app')
-    })
-    logger.debug("Main Firebase app initialized")
-
-    # Initialize Storage app
-    storage_cred_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                   'firebase', 'innofund-storage-firebase-admin.json')
-    logger.debug(f"Storage Firebase credentials path: {storage_cred_path}")
-    storage_app = initialize_app(credentials.Certificate(storage_cred_path), {
-        'storageBucket': os.getenv('STORAGE_BUCKET', 'innofund-own.appspot.com')
-    }, name='storage')
-    logger.debug("Storage Firebase app initialized")
-
-    # Initialize RTDB app
-    rtdb_cred_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                'firebase', 'innofund-rtdb-firebase-admin.json')
-    logger.debug(f"RTDB Firebase credentials path: {rtdb_cred_path}")
-    rtdb_app = initialize_app(credentials.Certificate(rtdb_cred_path), {
-        'databaseURL': os.getenv('RTDB_DATABASE_URL', 'https://innofund-own-rtdb-default-rtdb.asia-southeast1.firebasedatabase.app')
-    }, name='rtdb')
-    logger.debug("RTDB Firebase app initialized")
-
-except Exception as e:
-    logger.error(f"Error initializing Firebase: {str(e)}")
-    import traceback
-    logger.error(traceback.format_exc())
-    raise
-
 load_dotenv()
 
 # Initialize Flask-Login
@@ -71,11 +26,16 @@ moment = Moment()
 def create_app():
     try:
         app = Flask(__name__)
+        app.json = FastJSONProvider(app)
         app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key')
         
         # Initialize extensions
         login_manager.init_app(app)
         moment.init_app(app)
+        # Firebase apps and Web3 clients are created on first use
+        firebase.init_app(app)
+        from app.utils.web3_utils import web3_clients
+        web3_clients.init_app(app)
         login_manager.login_view = 'auth.login'
         
         # Register blueprints
@@ -87,6 +47,16 @@ def create_app():
         app.register_blueprint(auth_bp)
         app.register_blueprint(blockchain_bp, url_prefix='/blockchain')
         
+        # Keep funding totals in sync from contract events
+        from app.utils.funding_indexer import FUNDING_INDEXER_ENABLED, start_funding_indexer
+        if FUNDING_INDEXER_ENABLED:
+            start_funding_indexer()
+        
+        # Resume on-chain project creations left unfinished by a previous process
+        from app.utils.chain_jobs import CHAIN_RESUME_ON_START, start_workers
+        if CHAIN_RESUME_ON_START:
+            start_workers(resume=True)
+        
         return app
         
     except Exception as e:
@@ -95,26 +65,32 @@ def create_app():
         logger.error(traceback.format_exc())
         raise
 
+def _fetch_user(user_id):
+    """Build a User from Firebase Auth and the Firestore profile"""
+    from app.models import User
+    from firebase_admin import auth
+    
+    user = auth.get_user(user_id, app=firebase.get_app())
+    db = firebase.firestore()
+    user_doc = db.collection('users').document(user_id).get()
+    
+    if user_doc.exists:
+        user_data = user_doc.to_dict()
+        return User(
+            uid=user.uid,
+            email=user.email,
+            display_name=user_data.get('display_name', user.display_name),
+            photo_url=user_data.get('photo_url', user.photo_url)
+        )
+    return None
+
 @login_manager.user_loader
 def load_user(user_id):
     try:
         logger.debug(f"Loading user: {user_id}")
-        from app.models import User
-        from firebase_admin import auth
-        
-        user = auth.get_user(user_id)
-        db = firestore.client()
-        user_doc = db.collection('users').document(user_id).get()
+        from app.utils.user_sessions import user_sessions
         
-        if user_doc.exists:
-            user_data = user_doc.to_dict()
-            return User(
-                uid=user.uid,
-                email=user.email,
-                display_name=user_data.get('display_name', user.display_name),
-                photo_url=user_data.get('photo_url', user.photo_url)
-            )
-        return None
+        return user_sessions.load(user_id, _fetch_user)
         
     except Exception as e:
         logger.error(f"Error loading user: {str(e)}")
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash, session, current_app, jsonify
-from firebase_admin import auth as firebase_auth, firestore
+from firebase_admin import auth as firebase_auth
 import requests
 from requests_oauthlib import OAuth2Session
 import os
@@ -8,6 +8,9 @@ import json
 from datetime import datetime
 from flask_login import login_user, logout_user, login_required, current_user, LoginManager
 from app.models import User
+from app.utils.user_profiles import user_profiles
+from app.utils.user_sessions import user_sessions
+from app.utils.firebase_clients import firebase, firestore_db
 from urllib.parse import urlparse
 import logging
 
@@ -16,8 +19,8 @@ logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
-# Initialize Firestore
-db = firestore.client()
+# Firestore client, created on first use
+db = firestore_db
 
 # OAuth 2.0 endpoints
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
@@ -32,6 +35,8 @@ def store_user_data(user_id, user_data):
         users_ref = db.collection('users').document(user_id)
         user_data['last_login'] = datetime.now()
         users_ref.set(user_data, merge=True)
+        user_profiles.invalidate(user_id)
+        user_sessions.invalidate(user_id)
         logger.info(f"Stored user data for {user_id}")
     except Exception as e:
         logger.error(f"Error storing user data: {str(e)}")
@@ -54,7 +59,7 @@ def login():
         
         try:
             # Get user from Firebase
-            user = firebase_auth.get_user_by_email(email)
+            user = firebase_auth.get_user_by_email(email, app=firebase.get_app())
             
             # Create User object with the new model structure
             user_obj = User(
@@ -99,7 +104,8 @@ def register():
             user = firebase_auth.create_user(
                 email=email,
                 password=password,
-                display_name=display_name
+                display_name=display_name,
+                app=firebase.get_app()
             )
             
             # Create User object
@@ -184,12 +190,13 @@ def google_callback():
         
         # Get or create Firebase user
         try:
-            user = firebase_auth.get_user_by_email(user_info['email'])
+            user = firebase_auth.get_user_by_email(user_info['email'], app=firebase.get_app())
         except:
             user = firebase_auth.create_user(
                 email=user_info['email'],
                 display_name=user_info.get('name'),
-                photo_url=user_info.get('picture')
+                photo_url=user_info.get('picture'),
+                app=firebase.get_app()
             )
         
         # Create User object
@@ -235,13 +242,14 @@ def github_callback():
             user_info = data['user']
             
             try:
-                user = firebase_auth.get_user_by_email(user_info['email'])
+                user = firebase_auth.get_user_by_email(user_info['email'], app=firebase.get_app())
             except:
                 user = firebase_auth.create_user(
                     email=user_info['email'],
                     display_name=user_info['displayName'],
                     photo_url=user_info['photoURL'],
-                    uid=user_info['uid']
+                    uid=user_info['uid'],
+                    app=firebase.get_app()
                 )
             
             # Store user data
@@ -265,11 +273,11 @@ def github_callback():
         if not id_token:
             raise ValueError("No ID token provided")
         
-        decoded_token = firebase_auth.verify_id_token(id_token)
+        decoded_token = firebase_auth.verify_id_token(id_token, app=firebase.get_app())
         uid = decoded_token['uid']
         logger.info(f"Verified GitHub token for UID: {uid}")
         
-        user = firebase_auth.get_user(uid)
+        user = firebase_auth.get_user(uid, app=firebase.get_app())
         user_doc = db.collection('users').document(uid).get()
         user_data = user_doc.to_dict() if user_doc.exists else {}
         
@@ -303,24 +311,28 @@ def github_callback():
         flash('GitHub login failed')
         return redirect(url_for('auth.login'))
 
+def _fetch_user(user_id):
+    """Build a User from Firebase Auth and the Firestore profile"""
+    # Get user from Firebase
+    user = firebase_auth.get_user(user_id, app=firebase.get_app())
+    
+    # Get additional data from Firestore
+    user_doc = db.collection('users').document(user_id).get()
+    user_data = user_doc.to_dict() if user_doc.exists else {}
+    
+    # Create User object
+    return User(
+        uid=user.uid,
+        email=user.email,
+        display_name=user.display_name or user_data.get('display_name'),
+        photo_url=user.photo_url or user_data.get('photo_url')
+    )
+
 login_manager = LoginManager()
 @login_manager.user_loader
 def load_user(user_id):
     try:
-        # Get user from Firebase
-        user = firebase_auth.get_user(user_id)
-        
-        # Get additional data from Firestore
-        user_doc = db.collection('users').document(user_id).get()
-        user_data = user_doc.to_dict() if user_doc.exists else {}
-        
-        # Create User object
-        return User(
-            uid=user.uid,
-            email=user.email,
-            display_name=user.display_name or user_data.get('display_name'),
-            photo_url=user.photo_url or user_data.get('photo_url')
-        )
+        return user_sessions.load(user_id, _fetch_user)
     except Exception as e:
         logger.error(f"Error loading user {user_id}: {str(e)}")
         return None
\ No newline at end of file
@@ -1,22 +1,23 @@
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
-from datetime import datetime
-from firebase_admin import firestore
+from datetime import datetime, timezone
 from web3 import Web3
 from .utils.web3_utils import (
     create_project_on_chain,
     contribute_to_project,
     create_project_proposal,
     get_project_details,
+    get_projects_state,
     get_platform_fees
 )
+from .utils.firebase_clients import firestore_db
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize Firestore
-db = firestore.client()
+# Firestore client, created on first use
+db = firestore_db
 blockchain_bp = Blueprint('blockchain', __name__)
 
 @blockchain_bp.route('/create-project-chain', methods=['POST'])
@@ -81,13 +82,18 @@ def contribute(project_id):
 
         # Record contribution intent in Firebase
         try:
+            project_doc = db.collection('projects').document(project_id).get()
+            project_title = project_doc.to_dict().get('title', 'Unknown Project') if project_doc.exists else 'Unknown Project'
+            
             contribution_data = {
                 'project_id': project_id,
+                'project_title': project_title,
                 'contributor_id': current_user.id,
                 'amount': amount,
                 'platform_fees': Web3.from_wei(platform_fees, 'ether'),
                 'status': 'pending',
                 'created_at': datetime.utcnow(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'transaction_data': transaction_data
             }
             
@@ -169,3 +175,32 @@ def create_proposal(project_id):
     except Exception as e:
         logger.error(f"Unexpected error in proposal creation: {str(e)}")
         return jsonify({'error': str(e)}), 500
+
+@blockchain_bp.route('/projects-state')
+def projects_state():
+    """Get on-chain state for many projects in one round trip"""
+    try:
+        ids = [project_id for project_id in request.args.get('ids', '').split(',') if project_id.strip()]
+        if not ids:
+            return jsonify({'error': 'No project IDs provided'}), 400
+        if len(ids) > 100:
+            return jsonify({'error': 'Too many project IDs'}), 400
+            
+        states = get_projects_state(ids)
+        for state in states.values():
+            details = state['details']
+            if details:
+                details['funding_goal'] = float(details['funding_goal'])
+                details['current_funding'] = float(details['current_funding'])
+                details['deadline'] = details['deadline'].isoformat()
+        
+        return jsonify({
+            'success': True,
+            'projects': {str(project_id): state for project_id, state in states.items()}
+        })
+    except ValueError as e:
+        logger.error(f"Value error in projects state: {str(e)}")
+        return jsonify({'error': 'Invalid project IDs'}), 400
+    except Exception as e:
+        logger.error(f"Unexpected error in projects state: {str(e)}")
+        return jsonify({'error': str(e)}), 500
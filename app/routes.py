@@ -6,56 +6,61 @@ from web3 import Web3
 import firebase_admin
 from firebase_admin import credentials, firestore, storage
 from firebase_admin import db as rtdb
-from firebase_admin import get_app
 import requests
 import json
+import heapq
 from .utils.web3_utils import (
     contribute_to_project, 
-    create_project_on_chain, 
     get_platform_fees,
     get_project_details,
     create_project_proposal
 )
+from .utils.project_catalog import project_catalog
+from .utils.search_index import search_index, SEARCH_PAGE_SIZE
+from .utils.project_summaries import project_summaries, summarize
+from .utils.user_profiles import user_profiles, USER_PROFILE_TTL
+from .utils.user_projects import add_user_project, get_user_project_ids
+from .utils.chain_jobs import enqueue_project_creation, get_chain_status
+from .utils.funding_indexer import FUNDING_INDEXER_ENABLED, normalize_tx_hash
+from .utils.user_sessions import user_sessions
+from .utils.firebase_clients import firebase, firestore_db
+from .utils.http_cache import conditional_json
+from .utils.document_uploads import upload_documents
+from .utils.browsing_history import record_view
+from .utils.json_provider import json_array_response
+from .utils.records import ProjectRecord, parse_timestamp
+from .utils.landing_stats import (
+    get_landing_stats,
+    record_project_created,
+    record_donation,
+    record_project_deactivated
+)
+
+# Firestore client, created on first use
+db = firestore_db
 
-# Initialize Firestore
-db = firestore.client()
+# Keep the search index and card summaries in sync with the project catalog
+project_catalog.subscribe(search_index)
+project_catalog.subscribe(project_summaries)
 
 main = Blueprint('main', __name__)
 
+def _catalog_version(*args, **kwargs):
+    """ETag token for responses built from the project catalog"""
+    project_catalog.ensure_loaded()
+    return project_catalog.version
+
+def _projects_page_version(*args, **kwargs):
+    # Cursor pages are read straight from RTDB, so only legacy pages follow the catalog
+    if 'page' in request.args and request.args.get('after') is None:
+        return _catalog_version()
+    return None
+
 @main.route('/')
 def index():
     try:
-        # Get stats from RTDB
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get() or {}
-        
-        # Calculate stats
-        active_projects = sum(1 for p in all_projects.values() if p.get('status') == 'active')
-        total_eth = sum(float(p.get('funds_raised', 0)) for p in all_projects.values())
-        
-        # Get unique researchers (creators + team members)
-        researchers = set()
-        for project in all_projects.values():
-            researchers.add(project.get('created_by'))
-            researchers.update(project.get('team_members', []))
-        researchers.discard(None)  # Remove None if present
-        
-        stats = {
-            'total_projects': active_projects,
-            'total_eth': round(total_eth, 2),
-            'total_researchers': len(researchers)
-        }
-        
-        # Get featured projects (top 3 by funding progress)
-        featured_projects = []
-        for project_id, project in all_projects.items():
-            if project.get('status') == 'active':
-                project['id'] = project_id
-                project['funding_progress'] = (float(project.get('funds_raised', 0)) / float(project.get('goal_amount', 1))) * 100
-                featured_projects.append(project)
-        
-        featured_projects.sort(key=lambda x: x['funding_progress'], reverse=True)
-        featured_projects = featured_projects[:3]
+        # Get stats and top 3 featured projects from the maintained aggregate
+        stats, featured_projects = get_landing_stats()
         
         return render_template('landing1.html',
                              title='InnoFund - Decentralized Research Funding',
@@ -72,29 +77,21 @@ def index():
 @login_required
 def feed():
     try:
-        # Get initial projects from RTDB (just first 4)
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get()
+        # Get the first page of projects in key order
+        projects, next_cursor = project_catalog.page(limit=4)
         
-        # Convert to list and get first 4
         projects_list = []
-        if all_projects:
-            for project_id, project in all_projects.items():
-                project['id'] = project_id
-                # Initialize votes if not present
-                project['upvotes'] = project.get('upvotes', 0)
-                project['downvotes'] = project.get('downvotes', 0)
-                if isinstance(project.get('created_at'), str):
-                    try:
-                        project['created_at'] = datetime.fromisoformat(project['created_at'])
-                    except (ValueError, TypeError):
-                        project['created_at'] = None
-                projects_list.append(project)
-            projects_list = projects_list[:4]  # Only get first 4 projects
+        for project in projects:
+            # Initialize votes if not present
+            project['upvotes'] = project.get('upvotes', 0)
+            project['downvotes'] = project.get('downvotes', 0)
+            project['created_at'] = project.created_at_dt
+            projects_list.append(project)
         
         return render_template('dashboard.html', 
                              title='Research Projects',
-                             projects=projects_list)
+                             projects=projects_list,
+                             next_cursor=next_cursor)
     except Exception as e:
         print("Feed error:", str(e))
         import traceback
@@ -145,6 +142,7 @@ def profile():
                 }
             }
             db.collection('users').document(current_user.id).set(user_data)
+            user_profiles.invalidate(current_user.id)
         else:
             user_data = user_doc.to_dict()
             user_data['id'] = current_user.id
@@ -230,20 +228,6 @@ def create_project():
 
             print("\n=== Starting Project Creation ===")
             
-            # Create project on blockchain first
-            try:
-                blockchain_project_id = create_project_on_chain(
-                    name=request.form['title'],
-                    description=request.form['description'],
-                    funding_goal=goal_amount,
-                    deadline_days=1
-                )
-                print(f"Created project on blockchain with ID: {blockchain_project_id}")
-            except Exception as e:
-                print(f"Error creating project on blockchain: {str(e)}")
-                flash('Failed to create project on blockchain. Please try again.', 'error')
-                return redirect(url_for('main.create_project'))
-
             # Clean up team member IDs
             team_members = request.form.getlist('team_members[]')
             cleaned_team_members = []
@@ -267,42 +251,25 @@ def create_project():
                 'documents': [],
                 'upvotes': 0,
                 'downvotes': 0,
-                'blockchain_project_id': int(blockchain_project_id)  # Store blockchain ID
+                'chain_status': 'pending',  # Blockchain ID is backfilled by the chain worker
+                'chain_deadline_days': 1
             }
             
             print("\nProject Data:", project_data)
 
             # Handle file uploads
             if 'documents[]' in request.files:
-                storage_app = get_app('storage')
-                bucket = storage.bucket(app=storage_app)
-                
-                files = request.files.getlist('documents[]')
-                for file in files:
-                    if file and file.filename:
-                        try:
-                            filename = secure_filename(file.filename)
-                            file_path = f"projects/{current_user.id}/{project_data['created_at']}/{filename}"
-                            
-                            blob = bucket.blob(file_path)
-                            blob.upload_from_string(
-                                file.read(),
-                                content_type=file.content_type
-                            )
-                            blob.make_public()
-                            
-                            project_data['documents'].append({
-                                'name': filename,
-                                'url': blob.public_url
-                            })
-                        except Exception as e:
-                            print(f"Error uploading file {filename}:", str(e))
-                            continue
+                project_data['documents'] = upload_documents(
+                    request.files.getlist('documents[]'),
+                    f"projects/{current_user.id}/{project_data['created_at']}"
+                )
 
             # Save to RTDB
-            rtdb_app = get_app('rtdb')
+            rtdb_app = firebase.get_app('rtdb')
             ref = rtdb.reference('projects', app=rtdb_app)
             new_project_ref = ref.push(project_data)
+            project_catalog.invalidate(new_project_ref.key)
+            record_project_created(new_project_ref.key, project_data)
             
             # Also save to Firestore for better querying
             firestore_project_data = project_data.copy()
@@ -314,6 +281,16 @@ def create_project():
             user_doc.update({
                 'projects': firestore.ArrayUnion([new_project_ref.key])
             })
+            add_user_project(current_user.id, new_project_ref.key, project_data['created_at'])
+            
+            # Create the project on blockchain in the background
+            enqueue_project_creation(
+                project_id=new_project_ref.key,
+                name=project_data['title'],
+                description=project_data['description'],
+                funding_goal=goal_amount,
+                deadline_days=project_data['chain_deadline_days']
+            )
 
             print("\n=== Project Creation Completed Successfully ===")
             flash('Project created successfully!', 'success')
@@ -337,71 +314,21 @@ def my_projects():
         print("\n=== Loading My Projects ===")
         print(f"User ID: {current_user.id}")
         
-        # Get user's stored project IDs
-        user_doc = db.collection('users').document(current_user.id).get()
-        if not user_doc.exists:
-            return redirect(url_for('main.dashboard'))
-            
-        user_data = user_doc.to_dict()
-        stored_project_ids = user_data.get('projects', [])
-        print(f"Found {len(stored_project_ids)} stored project IDs")
-
-        # Get all RTDB projects
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get()
-        
-        if not all_projects:
-            return render_template('my_projects.html',
-                                 title='My Projects',
-                                 projects=[],
-                                 has_more=False)
-        
-        # Filter and process projects
-        valid_projects = []
-        for project_id, project_data in all_projects.items():
-            if not project_data or not isinstance(project_data, dict):
-                continue
-                
-            if project_data.get('created_by') == current_user.id:
-                project_data['id'] = project_id
-                
-                # Convert timestamps
-                created_at = project_data.get('created_at')
-                if isinstance(created_at, str):
-                    project_data['created_at'] = datetime.fromisoformat(created_at)
-                deadline = project_data.get('deadline')
-                if isinstance(deadline, str):
-                    project_data['deadline'] = datetime.fromisoformat(deadline)
-                    
-                valid_projects.append(project_data)
-                
-        print(f"Found {len(valid_projects)} valid projects for user")
-        
-        # Sort projects by creation date (newest first)
-        def get_created_at(project):
-            created_at = project.get('created_at')
-            if isinstance(created_at, str):
-                try:
-                    dt = datetime.fromisoformat(created_at)
-                    # Ensure timezone awareness
-                    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-                except ValueError:
-                    return datetime.min.replace(tzinfo=timezone.utc)
-            elif isinstance(created_at, datetime):
-                # Ensure timezone awareness
-                return created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)
-            return datetime.min.replace(tzinfo=timezone.utc)
-            
-        valid_projects.sort(key=get_created_at, reverse=True)
+        # Get the user's project IDs from the per-user index (newest first)
+        project_ids = get_user_project_ids(current_user.id)
+        print(f"Found {len(project_ids)} indexed project IDs")
         
-        # Get first 6 projects for initial display
-        display_projects = valid_projects[:6]
+        # Load only the first 6 projects for initial display
+        display_projects = [
+            project.with_datetimes()
+            for project in project_catalog.get_many(project_ids[:6], load=False)
+        ]
         print(f"Returning {len(display_projects)} projects")
         
         return render_template('my_projects.html',
                              title='My Projects',
                              projects=display_projects,
-                             has_more=len(valid_projects) > 6)
+                             has_more=len(project_ids) > 6)
                              
     except Exception as e:
         print("\n!!! My Projects Error !!!")
@@ -415,42 +342,22 @@ def my_projects():
 
 @main.route('/api/my-projects')
 @login_required
+@conditional_json(cache_control='private, no-cache')
 def get_my_projects():
     try:
         page = int(request.args.get('page', 1))
         per_page = 6
         start_idx = (page - 1) * per_page
 
-        # Get all RTDB projects
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get()
-        
-        if not all_projects:
-            return jsonify({'projects': [], 'has_more': False})
-        
-        # Filter projects that belong to the user
-        user_projects = {
-            pid: data for pid, data in all_projects.items()
-            if data and isinstance(data, dict) and data.get('created_by') == current_user.id
-        }
-        
-        # Sort projects by creation date (newest first)
-        sorted_projects = sorted(
-            user_projects.items(),
-            key=lambda x: x[1].get('created_at', ''),
-            reverse=True
-        )
+        # Get the user's project IDs from the per-user index (newest first)
+        project_ids = get_user_project_ids(current_user.id)
         
         # Paginate
-        page_projects = sorted_projects[start_idx:start_idx + per_page]
-        projects = []
-        for project_id, project_data in page_projects:
-            project_data['id'] = project_id
-            projects.append(project_data)
+        projects = project_catalog.get_many(project_ids[start_idx:start_idx + per_page], load=False)
 
         return jsonify({
-            'projects': projects,
-            'has_more': start_idx + per_page < len(sorted_projects)
+            'projects': [summarize(project) for project in projects],
+            'has_more': start_idx + per_page < len(project_ids)
         })
 
     except Exception as e:
@@ -461,7 +368,7 @@ def get_my_projects():
 @login_required
 def edit_project(project_id):
     try:
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
+        rtdb_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
         project_ref = rtdb_ref.child(project_id)
         
         if request.method == 'POST':
@@ -481,30 +388,16 @@ def edit_project(project_id):
             
             # Handle new file uploads
             if 'documents[]' in request.files:
-                files = request.files.getlist('documents[]')
-                bucket = storage.bucket(app=get_app('storage'))
-                
-                for file in files:
-                    if file and file.filename:
-                        filename = secure_filename(file.filename)
-                        file_path = f"projects/{current_user.id}/{datetime.utcnow().isoformat()}/{filename}"
-                        blob = bucket.blob(file_path)
-                        blob.upload_from_string(
-                            file.read(),
-                            content_type=file.content_type
-                        )
-                        blob.make_public()
-                        
-                        # Append to existing documents
-                        if 'documents' not in project_data:
-                            project_data['documents'] = []
-                        project_data['documents'].append({
-                            'name': filename,
-                            'url': blob.public_url
-                        })
+                documents = upload_documents(
+                    request.files.getlist('documents[]'),
+                    f"projects/{current_user.id}/{datetime.utcnow().isoformat()}"
+                )
+                if documents:
+                    project_data['documents'] = documents
             
             # Update the project
             project_ref.update(project_data)
+            project_catalog.invalidate(project_id)
             flash('Project updated successfully!', 'success')
             return redirect(url_for('main.my_projects'))
             
@@ -573,6 +466,7 @@ def update_project_funds(project_id):
         return jsonify({'error': 'Error processing donation'}), 500
 
 @main.route('/search-projects')
+@conditional_json(version=_catalog_version)
 def search_projects():
     try:
         query = request.args.get('q', '').lower()
@@ -580,50 +474,34 @@ def search_projects():
             'status': request.args.get('status'),
             'min_goal': request.args.get('min_goal', type=float),
             'max_goal': request.args.get('max_goal', type=float),
-            'sort_by': request.args.get('sort_by', 'recent')  # recent, goal, progress
+            'sort_by': request.args.get('sort_by', 'recent')  # recent, goal, progress, relevance
         }
         
-        # Get all projects
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get()
-        
-        if not all_projects:
-            return jsonify([])
-            
-        # Convert to list
-        projects_list = []
-        for project_id, project in all_projects.items():
-            project['id'] = project_id
-            projects_list.append(project)
-        
-        # Filter and search projects
-        results = []
-        for project in projects_list:
-            # Search in title and description
-            if query and query not in project['title'].lower() and query not in project['description'].lower():
-                continue
-                
-            # Apply filters
-            if filters['status'] and project['status'] != filters['status']:
-                continue
-                
-            if filters['min_goal'] and project['goal_amount'] < filters['min_goal']:
-                continue
-                
-            if filters['max_goal'] and project['goal_amount'] > filters['max_goal']:
-                continue
-                
-            results.append(project)
-        
-        # Sort results
-        if filters['sort_by'] == 'recent':
-            results.sort(key=lambda x: x['created_at'], reverse=True)
-        elif filters['sort_by'] == 'goal':
-            results.sort(key=lambda x: x['goal_amount'], reverse=True)
-        elif filters['sort_by'] == 'progress':
-            results.sort(key=lambda x: (x.get('funds_raised', 0) / x['goal_amount']), reverse=True)
+        # Look up matching projects in the search index
+        project_catalog.ensure_loaded()
+        project_ids = search_index.search(
+            query,
+            status=filters['status'],
+            min_goal=filters['min_goal'],
+            max_goal=filters['max_goal']
+        )
+        results = project_catalog.get_many(project_ids)
+        
+        # One page at a time; a page only needs its top offset + limit results selected, not a full sort
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = max(request.args.get('limit', SEARCH_PAGE_SIZE, type=int), 0)
+        sort_keys = {
+            'recent': lambda x: x.created_ts,
+            'goal': lambda x: x['goal_amount'],
+            'progress': lambda x: x.get('funds_raised', 0) / x['goal_amount']
+        }
+        sort_key = sort_keys.get(filters['sort_by'])
+        if sort_key:
+            results = heapq.nlargest(offset + limit, results, key=sort_key)[offset:]
+        else:
+            results = results[offset:offset + limit]
             
-        return jsonify(results)
+        return json_array_response(summarize(project) for project in results)
         
     except Exception as e:
         print("Search error:", str(e))
@@ -637,7 +515,7 @@ def view_project(project_id):
         
         # Get project data from RTDB
         print("Got project reference")
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
+        rtdb_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
         project = rtdb_ref.child(project_id).get()
         
         if not project:
@@ -647,71 +525,44 @@ def view_project(project_id):
         print("Project data:", project)
         
         # Convert string timestamps to datetime objects
-        if isinstance(project.get('created_at'), str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
-        if isinstance(project.get('last_updated'), str):
-            project['last_updated'] = datetime.fromisoformat(project['last_updated'])
+        project = ProjectRecord(project).with_datetimes()
             
         # Convert transaction timestamps
         if 'transactions' in project:
             for tx in project['transactions']:
                 if isinstance(tx.get('timestamp'), str):
-                    tx['timestamp'] = datetime.fromisoformat(tx['timestamp'])
+                    tx['timestamp'] = parse_timestamp(tx['timestamp']) or tx['timestamp']
                     
-        # Store in browsing history if user is logged in
+        # Store in browsing history if user is logged in; written in the background
         if current_user.is_authenticated:
-            print(f"Storing browsing history for user: {current_user.id}")
-            try:
-                history_ref = db.collection('browsing_history').document(current_user.id)
-                history = history_ref.get()
-                
-                if history.exists:
-                    current_history = history.to_dict().get('history', [])
-                else:
-                    current_history = []
-                    
-                # Add current project to history
-                current_history.append({
-                    'project_id': project_id,
-                    'timestamp': datetime.now(timezone.utc)
-                })
-                
-                # Keep only last 50 items
-                if len(current_history) > 50:
-                    current_history = current_history[-50:]
-                    
-                history_ref.set({'history': current_history}, merge=True)
-                print("Browsing history updated successfully")
-                
-            except Exception as e:
-                print(f"Error updating browsing history: {str(e)}")
+            record_view(current_user.id, project_id)
                 
         # Get user's vote if logged in
         user_vote = None
         if current_user.is_authenticated:
-            print(f"Getting votes for user: {current_user.id}")
-            votes_ref = rtdb.reference(f'project_votes/{project_id}', app=get_app('rtdb'))
-            votes = votes_ref.get() or {}
-            user_vote = votes.get(current_user.id)
+            print(f"Getting vote for user: {current_user.id}")
+            user_vote = rtdb.reference(f'project_votes/{project_id}/{current_user.id}', app=firebase.get_app('rtdb')).get()
             print(f"User vote: {user_vote}")
             
-        # Get creator info
+        # Get user's poll ballot if logged in
+        user_poll_vote = None
+        if current_user.is_authenticated and project.get('poll'):
+            user_poll_vote = rtdb.reference(f'poll_ballots/{project_id}/{current_user.id}', app=firebase.get_app('rtdb')).get()
+            
+        # Get creator and team member info in one batched lookup
         creator_id = project.get('created_by')
-        creator = None
-        if creator_id:
-            print(f"Getting creator info for: {creator_id}")
-            creator_doc = db.collection('users').document(creator_id).get()
-            if creator_doc.exists:
-                creator = creator_doc.to_dict()
-                print("Creator found")
+        member_ids = project.get('team_members', []) or []
+        profiles = user_profiles.get_many([creator_id] + list(member_ids))
+        
+        creator = profiles.get(creator_id) if creator_id else None
+        if creator:
+            print("Creator found")
                 
         # Get team member info
         team_members = []
-        for member_id in project.get('team_members', []):
-            print(f"Getting team member info for: {member_id}")
-            member_doc = db.collection('users').document(member_id).get()
-            if member_doc.exists:
-                member_data = member_doc.to_dict()
+        for member_id in member_ids:
+            member_data = profiles.get(member_id)
+            if member_data:
                 team_members.append({
                     'id': member_id,
                     'name': member_data.get('name', 'Unknown'),
@@ -720,7 +571,6 @@ def view_project(project_id):
                     'photo_url': member_data.get('photo_url', None),
                     'title': member_data.get('role', 'Team Member')  # Use role as title if available
                 })
-                print(f"Team member found: {member_data}")
             else:
                 # Add basic info for members not found in database
                 team_members.append({
@@ -738,7 +588,8 @@ def view_project(project_id):
                              project=project,
                              creator=creator,
                              team_members=team_members,
-                             user_vote=user_vote)
+                             user_vote=user_vote,
+                             user_poll_vote=user_poll_vote)
                              
     except Exception as e:
         print("\n!!! View Project Error !!!")
@@ -803,6 +654,8 @@ def api_connect_wallet():
             'wallet_address': wallet_address,
             'wallet_connected_at': datetime.now(timezone.utc)
         })
+        user_profiles.invalidate(current_user.id)
+        user_sessions.invalidate(current_user.id)
         
         print(f"Wallet connected successfully: {wallet_address}")
         return jsonify({
@@ -828,6 +681,8 @@ def api_disconnect_wallet():
             'wallet_address': None,
             'wallet_connected_at': None
         })
+        user_profiles.invalidate(current_user.id)
+        user_sessions.invalidate(current_user.id)
         
         print("Wallet disconnected successfully")
         return jsonify({'success': True})
@@ -839,15 +694,15 @@ def api_disconnect_wallet():
         return jsonify({'error': 'Failed to disconnect wallet'}), 500
 
 @main.route('/api/user/<user_id>')
+@conditional_json(cache_control=f'public, max-age={int(USER_PROFILE_TTL)}')
 def get_user_data(user_id):
     try:
-        # Get user data from Firestore
-        user_doc = db.collection('users').document(user_id).get()
+        # Get user data from the profile cache
+        user_data = user_profiles.get(user_id)
         
-        if not user_doc.exists:
+        if not user_data:
             return jsonify({'success': False, 'error': 'User not found'})
             
-        user_data = user_doc.to_dict()
         return jsonify({
             'success': True,
             'display_name': user_data.get('display_name'),
@@ -862,7 +717,7 @@ def get_user_data(user_id):
 def deactivate_project(project_id):
     try:
         # Get project reference
-        project_ref = rtdb.reference('projects', app=get_app('rtdb')).child(project_id)
+        project_ref = rtdb.reference('projects', app=firebase.get_app('rtdb')).child(project_id)
         project = project_ref.get()
         
         if not project:
@@ -877,6 +732,9 @@ def deactivate_project(project_id):
             'status': 'inactive',
             'deactivated_at': datetime.now().isoformat()
         })
+        project_catalog.invalidate(project_id)
+        if project.get('status') == 'active':
+            record_project_deactivated(project_id)
         
         return jsonify({'success': True})
         
@@ -887,37 +745,64 @@ def deactivate_project(project_id):
         return jsonify({'error': 'Error deactivating project'}), 500
 
 @main.route('/api/projects')
+@conditional_json(version=_projects_page_version)
 def get_paginated_projects():
     try:
-        page = int(request.args.get('page', 1))
-        per_page = 4  # Number of projects per page
-        
-        # Get all projects from RTDB
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        all_projects = rtdb_ref.get()
+        limit = min(max(request.args.get('limit', 4, type=int), 1), 50)
+        after = request.args.get('after')
         
-        if not all_projects:
-            return jsonify({'projects': [], 'has_more': False})
-        
-        # Convert to list
-        projects_list = []
-        for project_id, project in all_projects.items():
-            project['id'] = project_id
-            projects_list.append(project)
+        # Legacy page-number pagination
+        if 'page' in request.args and after is None:
+            page = int(request.args.get('page', 1))
+            all_projects = project_catalog.all()
+            
+            if not all_projects:
+                return jsonify({'projects': [], 'has_more': False})
+            
+            # Convert to list in key order
+            projects_list = []
+            for project_id in sorted(all_projects):
+                project = all_projects[project_id]
+                project['id'] = project_id
+                projects_list.append(project)
+            
+            # Calculate pagination
+            start_idx = (page - 1) * limit
+            end_idx = start_idx + limit
+            paginated_projects = projects_list[start_idx:end_idx]
+            
+            return jsonify({
+                'projects': [summarize(project) for project in paginated_projects],
+                'has_more': end_idx < len(projects_list)
+            })
         
-        # Calculate pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_projects = projects_list[start_idx:end_idx]
+        # Cursor pagination straight from an ordered query on the summaries projection
+        projects, next_cursor = project_summaries.page(after=after, limit=limit)
+        if not projects and after is None:
+            # Projection not built yet
+            projects, next_cursor = project_catalog.page(limit=limit)
+            projects = [summarize(project) for project in projects]
         
         return jsonify({
-            'projects': paginated_projects,
-            'has_more': end_idx < len(projects_list)
+            'projects': projects,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         })
     except Exception as e:
         print("Pagination error:", str(e))
         return jsonify({'error': 'Failed to load projects'}), 500
 
+@main.route('/api/projects/<project_id>/chain-status')
+def project_chain_status(project_id):
+    try:
+        status = get_chain_status(project_id)
+        if status is None:
+            return jsonify({'error': 'Project not found'}), 404
+        return jsonify(status)
+    except Exception as e:
+        print("Chain status error:", str(e))
+        return jsonify({'error': 'Failed to load chain status'}), 500
+
 @main.route('/api/vote/<project_id>', methods=['POST'])
 @login_required
 def vote_project(project_id):
@@ -928,51 +813,44 @@ def vote_project(project_id):
         if vote_type not in ['up', 'down']:
             return jsonify({'success': False, 'error': 'Invalid vote type'}), 400
             
-        # Get project reference from RTDB
-        project_ref = rtdb.reference(f'projects/{project_id}', app=get_app('rtdb'))
-        project = project_ref.get()
-        
-        if not project:
+        # Check the project exists with a single-field read
+        project_ref = rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
+        if project_ref.child('created_by').get() is None:
             return jsonify({'success': False, 'error': 'Project not found'}), 404
             
-        # Get user's current vote
-        votes_ref = rtdb.reference(f'project_votes/{project_id}', app=get_app('rtdb'))
-        user_votes = votes_ref.get() or {}
-        user_vote = user_votes.get(current_user.id)
-        
-        # Update vote counts
-        upvotes = project.get('upvotes', 0)
-        downvotes = project.get('downvotes', 0)
-        
-        # Remove previous vote if exists
-        if user_vote == 'up':
-            upvotes = max(0, upvotes - 1)
-        elif user_vote == 'down':
-            downvotes = max(0, downvotes - 1)
-        
-        # Add new vote
-        if 'votes' not in project:
-            project['votes'] = {}
-        if vote_type not in project['votes']:
-            project['votes'][vote_type] = 0
-        project['votes'][vote_type] += 1
-        
-        # Update project votes
-        project_ref.update({
-            'votes': project['votes']
-        })
-        
-        # Update user's vote
-        if vote_type:
-            votes_ref.update({current_user.id: vote_type})
-        else:
-            votes_ref.child(current_user.id).delete()
+        # Swap the user's vote atomically; voting the same way again removes the vote
+        previous = {}
+        def apply_vote(current):
+            previous['vote'] = current
+            return None if current == vote_type else vote_type
+        
+        user_vote_ref = rtdb.reference(f'project_votes/{project_id}/{current_user.id}', app=firebase.get_app('rtdb'))
+        user_vote = user_vote_ref.transaction(apply_vote)
+        previous_vote = previous.get('vote')
+        
+        # Adjust only the counters that changed
+        deltas = {'upvotes': 0, 'downvotes': 0}
+        if previous_vote in ('up', 'down'):
+            deltas['upvotes' if previous_vote == 'up' else 'downvotes'] -= 1
+        if user_vote in ('up', 'down'):
+            deltas['upvotes' if user_vote == 'up' else 'downvotes'] += 1
+        
+        counts = {}
+        for field, delta in deltas.items():
+            counter_ref = project_ref.child(field)
+            if delta:
+                counts[field] = counter_ref.transaction(
+                    lambda current, delta=delta: max(0, (current or 0) + delta)
+                )
+            else:
+                counts[field] = counter_ref.get() or 0
+        project_catalog.patch(project_id, counts)
         
         return jsonify({
             'success': True,
-            'upvotes': upvotes,
-            'downvotes': downvotes,
-            'user_vote': vote_type
+            'upvotes': counts['upvotes'],
+            'downvotes': counts['downvotes'],
+            'user_vote': user_vote
         })
         
     except Exception as e:
@@ -992,7 +870,7 @@ def report_project():
             return jsonify({'error': 'Missing required fields'}), 400
 
         # Get project title from RTDB
-        project_ref = rtdb.reference(f'projects/{project_id}', app=get_app('rtdb'))
+        project_ref = rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
         project = project_ref.get()
         if not project:
             return jsonify({'error': 'Project not found'}), 404
@@ -1061,7 +939,7 @@ def donate(project_id):
             
         # If not in Firestore, try RTDB
         if blockchain_project_id is None:
-            rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
+            rtdb_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
             project_data = rtdb_ref.child(project_id).get()
             
             if not project_data:
@@ -1122,8 +1000,16 @@ def transaction_history():
         print("\n=== Loading Transaction History ===")
         print(f"User ID: {current_user.id}")
         
-        # Get user's transactions
-        contributions = db.collection('contributions').where('contributor_id', '==', current_user.id).stream()
+        # Get one page of the user's transactions, newest first
+        # (rows from before `timestamp` existed are filled in by scripts/backfill_contribution_timestamps.py)
+        per_page = 50
+        before = request.args.get('before')
+        query = (db.collection('contributions')
+                 .where('contributor_id', '==', current_user.id)
+                 .order_by('timestamp', direction=firestore.Query.DESCENDING))
+        if before:
+            query = query.start_after({'timestamp': before})
+        contributions = query.limit(per_page).stream()
         
         transactions = []
         for doc in contributions:
@@ -1131,30 +1017,42 @@ def transaction_history():
             tx['id'] = doc.id
             
             # Convert timestamps
-            created_at = tx.get('created_at')
-            if isinstance(created_at, str):
-                tx['timestamp'] = datetime.fromisoformat(created_at)
-            else:
-                tx['timestamp'] = created_at or datetime.now(timezone.utc)
-                
-            # Get project details
-            project_doc = db.collection('projects').document(tx['project_id']).get()
-            if project_doc.exists:
-                project_data = project_doc.to_dict()
-                tx['project_title'] = project_data.get('title', 'Unknown Project')
-            else:
-                tx['project_title'] = 'Unknown Project'
+            timestamp = tx.get('timestamp') or tx.get('created_at')
+            tx['timestamp_key'] = tx.get('timestamp')
+            tx['timestamp'] = parse_timestamp(timestamp) or datetime.now(timezone.utc)
                 
             transactions.append(tx)
             
         print(f"Found {len(transactions)} transactions")
         
-        # Sort by timestamp
-        transactions.sort(key=lambda x: x.get('timestamp', datetime.min), reverse=True)
+        # Resolve titles for legacy rows recorded before titles were stored on the contribution
+        untitled = {tx['project_id'] for tx in transactions if not tx.get('project_title') and tx.get('project_id')}
+        if untitled:
+            refs = [db.collection('projects').document(pid) for pid in untitled]
+            titles = {
+                snapshot.id: snapshot.to_dict().get('title', 'Unknown Project')
+                for snapshot in db.get_all(refs) if snapshot.exists
+            }
+            for tx in transactions:
+                if not tx.get('project_title'):
+                    tx['project_title'] = titles.get(tx.get('project_id'), 'Unknown Project')
+        
+        # Fill in contributor names missing from older contribution records
+        unnamed = [tx['contributor_id'] for tx in transactions if not tx.get('contributor_name') and tx.get('contributor_id')]
+        if unnamed:
+            profiles = user_profiles.get_many(unnamed)
+            for tx in transactions:
+                if not tx.get('contributor_name'):
+                    profile = profiles.get(tx.get('contributor_id')) or {}
+                    tx['contributor_name'] = profile.get('display_name', 'Anonymous')
+        
+        # Cursor for the next (older) page
+        next_before = transactions[-1]['timestamp_key'] if len(transactions) == per_page else None
         
         return render_template('transaction_history.html',
                              title='Transaction History',
-                             transactions=transactions)
+                             transactions=transactions,
+                             next_before=next_before)
                              
     except Exception as e:
         print("\n!!! Transaction History Error !!!")
@@ -1191,6 +1089,8 @@ def update_profile():
         
         # Update the user document
         user_doc.update(update_data)
+        user_profiles.invalidate(current_user.id)
+        user_sessions.invalidate(current_user.id)
         
         return jsonify({'success': True}), 200
     except Exception as e:
@@ -1204,7 +1104,7 @@ def update_profile():
 def create_poll(project_id):
     try:
         # Get project from RTDB
-        rtdb_ref = rtdb.reference(f'projects/{project_id}', app=get_app('rtdb'))
+        rtdb_ref = rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
         project = rtdb_ref.get()
         
         if not project:
@@ -1261,64 +1161,65 @@ def create_poll(project_id):
         print(f"Error creating poll: {str(e)}")
         return jsonify({'error': 'Failed to create poll'}), 500
 
+class _AlreadyVoted(Exception):
+    pass
+
 @main.route('/api/vote_poll/<project_id>/<option_id>', methods=['POST'])
 @login_required
 def vote_poll(project_id, option_id):
     try:
-        # Get project from RTDB
-        rtdb_ref = rtdb.reference(f'projects/{project_id}', app=get_app('rtdb'))
-        project = rtdb_ref.get()
-        
-        if not project:
-            return jsonify({'error': 'Project not found'}), 404
-            
-        poll = project.get('poll')
+        # Read the poll itself; the catalog copy may miss a poll created or deleted in another worker
+        poll_ref = rtdb.reference(f'projects/{project_id}/poll', app=firebase.get_app('rtdb'))
+        poll = poll_ref.get()
         if not poll:
+            if not project_catalog.get(project_id):
+                return jsonify({'error': 'Project not found'}), 404
             return jsonify({'error': 'No active poll found'}), 404
             
         # Find the option
-        option_found = False
-        user_previous_vote = None
-        target_option = None
-        
-        # Ensure all options have a voters list
-        for option in poll.get('options', []):
-            if 'voters' not in option:
-                option['voters'] = []
-            
-            # Check if user already voted for this option
-            if current_user.id in option['voters']:
-                if option['id'] == option_id:
-                    return jsonify({'error': 'Already voted for this option'}), 400
-                else:
-                    user_previous_vote = option
-                    
-            if option['id'] == option_id:
-                option_found = True
-                target_option = option
-                
-        if not option_found:
+        option_indexes = {option.get('id'): index for index, option in enumerate(poll.get('options', []))}
+        if option_id not in option_indexes:
             return jsonify({'error': 'Invalid option'}), 400
             
-        # Remove previous vote if exists
-        if user_previous_vote:
-            user_previous_vote['votes'] = max(0, user_previous_vote['votes'] - 1)
-            user_previous_vote['voters'].remove(current_user.id)
-            poll['total_votes'] = max(0, poll['total_votes'] - 1)
+        # Votes cast before ballots existed are only recorded in the legacy voters lists
+        legacy_vote = next((option.get('id') for option in poll.get('options', [])
+                            if current_user.id in (option.get('voters') or [])), None)
+        
+        # Record the user's ballot atomically
+        previous = {}
+        def apply_ballot(current):
+            current = current or legacy_vote
+            previous['option_id'] = current
+            if current == option_id:
+                raise _AlreadyVoted()
+            return option_id
+        
+        ballot_ref = rtdb.reference(f'poll_ballots/{project_id}/{current_user.id}', app=firebase.get_app('rtdb'))
+        try:
+            ballot_ref.transaction(apply_ballot)
+        except _AlreadyVoted:
+            return jsonify({'error': 'Already voted for this option'}), 400
+        previous_option = previous.get('option_id')
+        
+        # Update counters with transactions so concurrent votes don't overwrite each other
+        updated_poll = dict(poll)
+        updated_poll['options'] = [dict(option) for option in poll.get('options', [])]
+        
+        if previous_option in option_indexes:
+            index = option_indexes[previous_option]
+            updated_poll['options'][index]['votes'] = poll_ref.child(f'options/{index}/votes').transaction(
+                lambda current: max(0, (current or 0) - 1)
+            )
+        else:
+            updated_poll['total_votes'] = poll_ref.child('total_votes').transaction(
+                lambda current: (current or 0) + 1
+            )
             
-        # Add new vote
-        if 'votes' not in target_option:
-            target_option['votes'] = 0
-        target_option['votes'] += 1
-        target_option['voters'].append(current_user.id)
-        if 'total_votes' not in poll:
-            poll['total_votes'] = 0
-        poll['total_votes'] += 1
-        
-        # Update project with updated poll
-        rtdb_ref.update({
-            'poll': poll
-        })
+        index = option_indexes[option_id]
+        updated_poll['options'][index]['votes'] = poll_ref.child(f'options/{index}/votes').transaction(
+            lambda current: (current or 0) + 1
+        )
+        project_catalog.patch(project_id, {'poll': updated_poll})
         
         return jsonify({'message': 'Vote recorded successfully'}), 200
         
@@ -1328,12 +1229,43 @@ def vote_poll(project_id, option_id):
         traceback.print_exc()
         return jsonify({'error': 'Failed to record vote'}), 500
 
+@main.route('/api/poll_results/<project_id>')
+def poll_results(project_id):
+    try:
+        # Tallies come from the cached catalog copy of the project
+        project = project_catalog.get(project_id)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+            
+        poll = project.get('poll')
+        if not poll:
+            return jsonify({'error': 'No active poll found'}), 404
+            
+        user_vote = None
+        if current_user.is_authenticated:
+            user_vote = rtdb.reference(f'poll_ballots/{project_id}/{current_user.id}', app=firebase.get_app('rtdb')).get()
+            
+        return jsonify({
+            'question': poll.get('question'),
+            'total_votes': poll.get('total_votes', 0),
+            'options': [{
+                'id': option.get('id'),
+                'text': option.get('text'),
+                'votes': option.get('votes', 0)
+            } for option in poll.get('options', [])],
+            'user_vote': user_vote
+        })
+        
+    except Exception as e:
+        print(f"Error loading poll results: {str(e)}")
+        return jsonify({'error': 'Failed to load poll results'}), 500
+
 @main.route('/api/delete_poll/<project_id>', methods=['POST'])
 @login_required
 def delete_poll(project_id):
     try:
         # Get project from RTDB
-        rtdb_ref = rtdb.reference(f'projects/{project_id}', app=get_app('rtdb'))
+        rtdb_ref = rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
         project = rtdb_ref.get()
         
         if not project:
@@ -1347,6 +1279,8 @@ def delete_poll(project_id):
         rtdb_ref.update({
             'poll': None
         })
+        rtdb.reference(f'poll_ballots/{project_id}', app=firebase.get_app('rtdb')).delete()
+        project_catalog.invalidate(project_id)
         
         return jsonify({'message': 'Poll deleted successfully'}), 200
         
@@ -1373,9 +1307,14 @@ def confirm_donation(project_id):
             
         user_data = user_doc.to_dict()
         
+        # Get project data from RTDB
+        rtdb_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
+        project_data = rtdb_ref.child(project_id).get()
+        
         # Record donation in Firebase
         donation_data = {
             'project_id': project_id,
+            'project_title': (project_data or {}).get('title', 'Unknown Project'),
             'contributor_id': current_user.id,
             'contributor_name': user_data.get('display_name', 'Anonymous'),
             'amount': data['amount'],
@@ -1386,18 +1325,18 @@ def confirm_donation(project_id):
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
         
-        # Add to contributions collection
-        db.collection('contributions').add(donation_data)
-        
-        # Update project's funds in RTDB
-        rtdb_ref = rtdb.reference('projects', app=get_app('rtdb'))
-        project_data = rtdb_ref.child(project_id).get()
+        # Add to contributions collection, keyed by transaction hash so the funding indexer can match it
+        db.collection('contributions').document(normalize_tx_hash(data['transaction_hash'])).set(donation_data, merge=True)
         
-        if project_data:
+        # Update project's funds in RTDB unless the funding indexer applies them from chain events
+        if project_data and not FUNDING_INDEXER_ENABLED:
             current_funds = float(project_data.get('funds_raised', 0))
             rtdb_ref.child(project_id).update({
                 'funds_raised': current_funds + data['amount']
             })
+            project_catalog.invalidate(project_id)
+            project_data['funds_raised'] = current_funds + data['amount']
+            record_donation(project_id, data['amount'], project_data)
             
         return jsonify({'success': True})
         
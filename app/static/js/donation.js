@@ -38,7 +38,9 @@ async function handleDonation(projectId, amount) {
             to: data.transaction.to,
             data: data.transaction.data,
             value: ethers.parseEther(data.total_amount.toString()),
-            gasLimit: data.transaction.gas
+            gasLimit: data.transaction.gas,
+            maxFeePerGas: data.transaction.maxFeePerGas,
+            maxPriorityFeePerGas: data.transaction.maxPriorityFeePerGas
         });
 
         console.log('Transaction sent:', tx);
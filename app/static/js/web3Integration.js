@@ -171,6 +171,8 @@ async function handleDonation(projectId, amount) {
             data: data.transaction.data,
             value: ethers.parseEther(data.total_amount.toString()),
             gasLimit: data.transaction.gas,
+            maxFeePerGas: data.transaction.maxFeePerGas,
+            maxPriorityFeePerGas: data.transaction.maxPriorityFeePerGas,
             chainId: data.transaction.chainId
         });
 
@@ -0,0 +1,89 @@
+import os
+import json
+import logging
+from functools import lru_cache
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+WEB3_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'web3')
+
+# Built by scripts/build_abi_bundle.py from the Hardhat artifacts
+ABI_BUNDLE_PATH = os.getenv('ABI_BUNDLE_PATH', os.path.join(WEB3_DIR, 'abi_bundle.json'))
+
+
+def artifact_path(contract_name):
+    return os.path.join(WEB3_DIR, 'artifacts', 'contracts', f'{contract_name}.sol', f'{contract_name}.json')
+
+
+@lru_cache(maxsize=None)
+def _bundle():
+    """Read the ABI bundle once per process, or return {} when it hasn't been built"""
+    try:
+        with open(ABI_BUNDLE_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.info(f"ABI bundle not found at {ABI_BUNDLE_PATH}, reading Hardhat artifacts")
+        return {}
+
+
+def _load_artifact_abi(contract_name):
+    try:
+        with open(artifact_path(contract_name)) as f:
+            return json.load(f)['abi']
+    except FileNotFoundError:
+        logger.error(f"Contract ABI not found for {contract_name}")
+        raise
+    except json.JSONDecodeError:
+        logger.error(f"Invalid JSON in contract ABI file for {contract_name}")
+        raise
+
+
+def abi_signature(item):
+    """Canonical `name(type,...)` signature of an ABI function or event entry"""
+    def canonical(arg):
+        if arg['type'].startswith('tuple'):
+            return f"({','.join(canonical(component) for component in arg['components'])}){arg['type'][5:]}"
+        return arg['type']
+    return f"{item['name']}({','.join(canonical(arg) for arg in item.get('inputs', []))})"
+
+
+@lru_cache(maxsize=None)
+def load_contract_abi(contract_name):
+    """Return the ABI of a contract, preferring the prebuilt bundle"""
+    entry = _bundle().get(contract_name)
+    if entry is not None:
+        return entry['abi']
+    return _load_artifact_abi(contract_name)
+
+
+@lru_cache(maxsize=None)
+def load_event_topics(contract_name):
+    """Return {topic0 hex: event name} for every event of a contract"""
+    entry = _bundle().get(contract_name)
+    if entry is not None:
+        signatures = entry['events']
+    else:
+        from web3 import Web3
+        signatures = {}
+        for item in load_contract_abi(contract_name):
+            if item.get('type') == 'event':
+                signature = abi_signature(item)
+                signatures[signature] = '0x' + Web3.keccak(text=signature).hex().lower().removeprefix('0x')
+    return {topic: signature.split('(', 1)[0] for signature, topic in signatures.items()}
+
+
+@lru_cache(maxsize=None)
+def load_function_selectors(contract_name):
+    """Return {signature: 4-byte selector hex} for every function of a contract"""
+    entry = _bundle().get(contract_name)
+    if entry is not None:
+        return dict(entry['functions'])
+
+    from web3 import Web3
+    selectors = {}
+    for item in load_contract_abi(contract_name):
+        if item.get('type') == 'function':
+            signature = abi_signature(item)
+            selectors[signature] = '0x' + Web3.keccak(text=signature).hex().lower().removeprefix('0x')[:8]
+    return selectors
@@ -0,0 +1,102 @@
+import os
+import time
+import atexit
+import threading
+import logging
+from datetime import datetime, timezone, timedelta
+from .firebase_clients import firebase
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes; repeat views inside one window are written once
+BROWSING_HISTORY_FLUSH_INTERVAL = float(os.getenv('BROWSING_HISTORY_FLUSH_INTERVAL', '5'))
+# Days before a Firestore TTL policy on views.expires_at deletes an entry
+BROWSING_HISTORY_TTL_DAYS = int(os.getenv('BROWSING_HISTORY_TTL_DAYS', '90'))
+# Views held in memory at most, so a Firestore outage can't grow the buffer without bound
+BROWSING_HISTORY_MAX_PENDING = int(os.getenv('BROWSING_HISTORY_MAX_PENDING', '10000'))
+
+# Firestore rejects batches with more than 500 writes
+_BATCH_SIZE = 500
+
+_pending = {}  # (uid, project_id) -> viewed_at
+_lock = threading.Lock()
+_thread = None
+
+
+def record_view(uid, project_id):
+    """Queue a project view for the background writer without touching Firestore"""
+    global _thread
+    with _lock:
+        if len(_pending) >= BROWSING_HISTORY_MAX_PENDING and (uid, project_id) not in _pending:
+            logger.warning("Browsing history buffer full, dropping view")
+            return
+        _pending[(uid, project_id)] = datetime.now(timezone.utc)
+
+        if _thread is None:
+            _thread = threading.Thread(target=_writer, daemon=True)
+            _thread.start()
+
+
+def flush():
+    """Append every queued view to browsing_history/<uid>/views and return how many were written
+
+    Views in a batch that fails to commit go back into the buffer for the next flush.
+    """
+    with _lock:
+        entries = list(_pending.items())
+        _pending.clear()
+    if not entries:
+        return 0
+
+    ttl = timedelta(days=BROWSING_HISTORY_TTL_DAYS)
+    written = 0
+    for start in range(0, len(entries), _BATCH_SIZE):
+        try:
+            db = firebase.firestore()
+            batch = db.batch()
+            for (uid, project_id), viewed_at in entries[start:start + _BATCH_SIZE]:
+                view_ref = db.collection('browsing_history').document(uid).collection('views').document()
+                batch.set(view_ref, {
+                    'project_id': project_id,
+                    'timestamp': viewed_at,
+                    'expires_at': viewed_at + ttl
+                })
+            batch.commit()
+        except Exception:
+            _requeue(entries[start:])
+            raise
+        written += len(entries[start:start + _BATCH_SIZE])
+    return written
+
+
+def _requeue(entries):
+    """Put unwritten views back, keeping newer views of the same project and the buffer cap"""
+    dropped = 0
+    with _lock:
+        for key, viewed_at in entries:
+            if key in _pending:
+                continue
+            if len(_pending) >= BROWSING_HISTORY_MAX_PENDING:
+                dropped += 1
+                continue
+            _pending[key] = viewed_at
+    if dropped:
+        logger.warning(f"Browsing history buffer full, dropped {dropped} unwritten views")
+
+
+def _writer():
+    while True:
+        time.sleep(BROWSING_HISTORY_FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception as e:
+            logger.error(f"Error writing browsing history: {str(e)}")
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        flush()
+    except Exception as e:
+        logger.error(f"Error writing browsing history on exit: {str(e)}")
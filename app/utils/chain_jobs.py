@@ -0,0 +1,193 @@
+import os
+import time
+import uuid
+import queue
+import threading
+import logging
+from datetime import datetime, timezone
+from firebase_admin import db as rtdb
+from .firebase_clients import firebase
+from .project_catalog import project_catalog
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Number of background threads submitting on-chain project creations
+CHAIN_WORKER_THREADS = int(os.getenv('CHAIN_WORKER_THREADS', '1'))
+# Seconds after which another process may take over an unfinished submission
+CHAIN_CLAIM_TIMEOUT = float(os.getenv('CHAIN_CLAIM_TIMEOUT', '600'))
+# Re-queue projects left pending or submitted by a previous process when the app starts
+CHAIN_RESUME_ON_START = os.getenv('CHAIN_RESUME_ON_START', 'false').lower() == 'true'
+
+CHAIN_STATUS_PENDING = 'pending'
+CHAIN_STATUS_SUBMITTED = 'submitted'
+CHAIN_STATUS_CONFIRMED = 'confirmed'
+CHAIN_STATUS_FAILED = 'failed'
+
+_jobs = queue.Queue()
+_queued = set()
+_workers = []
+_workers_lock = threading.Lock()
+
+# Identifies this process when claiming a job
+_worker_token = f"{os.getpid()}-{uuid.uuid4().hex}"
+
+
+class _AlreadyClaimed(Exception):
+    pass
+
+
+def _project_ref(project_id):
+    return rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
+
+
+def _record(project_id, updates):
+    """Write chain fields to RTDB and Firestore and refresh the cached project"""
+    _project_ref(project_id).update(updates)
+    try:
+        firebase.firestore().collection('projects').document(project_id).update(updates)
+    except Exception as e:
+        logger.error(f"Error updating Firestore chain status for {project_id}: {str(e)}")
+    project_catalog.invalidate(project_id)
+
+
+def claim_project(project_id):
+    """Atomically claim a project so only one process sends its transaction"""
+    def apply(current):
+        if current and current.get('token') != _worker_token and \
+                time.time() - float(current.get('at', 0)) < CHAIN_CLAIM_TIMEOUT:
+            raise _AlreadyClaimed()
+        return {'token': _worker_token, 'at': time.time()}
+
+    try:
+        _project_ref(project_id).child('chain_claim').transaction(apply)
+        return True
+    except _AlreadyClaimed:
+        return False
+
+
+def _queue_job(job):
+    with _workers_lock:
+        if job['project_id'] in _queued:
+            return
+        _queued.add(job['project_id'])
+    _jobs.put(job)
+
+
+def _process(job):
+    """Send the createProject transaction for a job and backfill the blockchain ID"""
+    from .web3_utils import submit_project_creation, wait_for_project_id
+
+    project_id = job['project_id']
+    try:
+        tx_hash = job.get('tx_hash')
+        if not tx_hash:
+            if not claim_project(project_id):
+                logger.info(f"Project {project_id} is being submitted by another process")
+                return
+            tx_hash = submit_project_creation(
+                name=job['name'],
+                description=job['description'],
+                funding_goal=job['funding_goal'],
+                deadline_days=job['deadline_days']
+            )
+            _record(project_id, {
+                'chain_status': CHAIN_STATUS_SUBMITTED,
+                'chain_tx_hash': tx_hash
+            })
+
+        blockchain_project_id = wait_for_project_id(tx_hash)
+        _record(project_id, {
+            'chain_status': CHAIN_STATUS_CONFIRMED,
+            'blockchain_project_id': int(blockchain_project_id),
+            'chain_confirmed_at': datetime.now(timezone.utc).isoformat()
+        })
+        logger.info(f"Project {project_id} confirmed on chain with ID {blockchain_project_id}")
+
+    except Exception as e:
+        logger.error(f"On-chain creation failed for project {project_id}: {str(e)}")
+        try:
+            _record(project_id, {
+                'chain_status': CHAIN_STATUS_FAILED,
+                'chain_error': str(e)
+            })
+        except Exception as record_error:
+            logger.error(f"Error recording chain failure for {project_id}: {str(record_error)}")
+
+
+def _worker():
+    while True:
+        job = _jobs.get()
+        try:
+            _process(job)
+        finally:
+            with _workers_lock:
+                _queued.discard(job['project_id'])
+            _jobs.task_done()
+
+
+def _resume_unfinished():
+    """Re-queue projects left pending or submitted by a previous process
+
+    Needs ".indexOn": ["chain_status"] on /projects in the RTDB rules.
+    """
+    try:
+        projects_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
+        for status in (CHAIN_STATUS_PENDING, CHAIN_STATUS_SUBMITTED):
+            projects = projects_ref.order_by_child('chain_status').equal_to(status).get() or {}
+            for project_id, project in projects.items():
+                if not project or not isinstance(project, dict):
+                    continue
+                _queue_job({
+                    'project_id': project_id,
+                    'name': project.get('title', ''),
+                    'description': project.get('description', ''),
+                    'funding_goal': float(project.get('goal_amount', 0)),
+                    'deadline_days': project.get('chain_deadline_days', 1),
+                    'tx_hash': project.get('chain_tx_hash')
+                })
+                logger.info(f"Resuming on-chain creation for project {project_id}")
+    except Exception as e:
+        logger.error(f"Error resuming pending chain jobs: {str(e)}")
+
+
+def start_workers(resume=False):
+    """Start the background chain workers once per process, optionally resuming unfinished projects"""
+    with _workers_lock:
+        if not _workers:
+            for _ in range(CHAIN_WORKER_THREADS):
+                thread = threading.Thread(target=_worker, daemon=True)
+                thread.start()
+                _workers.append(thread)
+    if resume:
+        threading.Thread(target=_resume_unfinished, daemon=True).start()
+
+
+def enqueue_project_creation(project_id, name, description, funding_goal, deadline_days):
+    """Queue an already persisted project for on-chain creation"""
+    start_workers()
+    _queue_job({
+        'project_id': project_id,
+        'name': name,
+        'description': description,
+        'funding_goal': funding_goal,
+        'deadline_days': deadline_days
+    })
+
+
+def get_chain_status(project_id):
+    """Return the chain fields of a project without reading the whole record"""
+    ref = _project_ref(project_id)
+    status = ref.child('chain_status').get()
+    blockchain_project_id = ref.child('blockchain_project_id').get()
+    if status is None and blockchain_project_id is None:
+        return None
+
+    result = {
+        # Projects created before the pipeline existed only carry a blockchain ID
+        'chain_status': status or CHAIN_STATUS_CONFIRMED,
+        'blockchain_project_id': blockchain_project_id
+    }
+    if result['chain_status'] == CHAIN_STATUS_FAILED:
+        result['chain_error'] = ref.child('chain_error').get()
+    return result
@@ -0,0 +1,52 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.utils import secure_filename
+from firebase_admin import storage
+from .firebase_clients import firebase
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Concurrent uploads shared by all requests of a worker
+DOCUMENT_UPLOAD_THREADS = int(os.getenv('DOCUMENT_UPLOAD_THREADS', '4'))
+# Resumable upload chunk size; GCS requires a multiple of 256 KB
+DOCUMENT_UPLOAD_CHUNK_SIZE = int(os.getenv('DOCUMENT_UPLOAD_CHUNK_SIZE', str(8 * 256 * 1024)))
+
+_executor = ThreadPoolExecutor(max_workers=DOCUMENT_UPLOAD_THREADS, thread_name_prefix='document-upload')
+
+
+def _upload(bucket, file, file_path):
+    """Stream one uploaded file into the bucket as a public object"""
+    blob = bucket.blob(file_path, chunk_size=DOCUMENT_UPLOAD_CHUNK_SIZE)
+    file.stream.seek(0)
+    blob.upload_from_file(
+        file.stream,
+        content_type=file.content_type,
+        predefined_acl='publicRead'
+    )
+    return blob.public_url
+
+
+def upload_documents(files, prefix):
+    """Upload request files under prefix concurrently and return [{'name', 'url'}] in form order
+
+    Files that fail to upload are logged and left out.
+    """
+    files = [file for file in files if file and file.filename]
+    if not files:
+        return []
+
+    bucket = storage.bucket(app=firebase.get_app('storage'))
+    futures = []
+    for file in files:
+        filename = secure_filename(file.filename)
+        futures.append((filename, _executor.submit(_upload, bucket, file, f"{prefix}/{filename}")))
+
+    documents = []
+    for filename, future in futures:
+        try:
+            documents.append({'name': filename, 'url': future.result()})
+        except Exception as e:
+            logger.error(f"Error uploading file {filename}: {str(e)}")
+    return documents
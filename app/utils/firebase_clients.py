@@ -0,0 +1,81 @@
+import os
+import threading
+import logging
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+FIREBASE_CREDENTIALS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'firebase')
+
+DEFAULT_APP = '[DEFAULT]'
+
+
+def _app_config(name):
+    """Return (credentials file, options) for one of the named Firebase apps"""
+    if name == DEFAULT_APP:
+        return 'innofund-firebase-admin.json', {
+            'databaseURL': os.getenv('FIREBASE_DATABASE_URL', 'https://innofund-own-default-rtdb.asia-southeast1.firebasedatabase.app')
+        }
+    if name == 'storage':
+        return 'innofund-storage-firebase-admin.json', {
+            'storageBucket': os.getenv('STORAGE_BUCKET', 'innofund-own.appspot.com')
+        }
+    if name == 'rtdb':
+        return 'innofund-rtdb-firebase-admin.json', {
+            'databaseURL': os.getenv('RTDB_DATABASE_URL', 'https://innofund-own-rtdb-default-rtdb.asia-southeast1.firebasedatabase.app')
+        }
+    raise ValueError(f"Unknown Firebase app: {name}")
+
+
+class FirebaseClients:
+    """Flask extension that initializes each Firebase app the first time it is used"""
+
+    def __init__(self, app=None):
+        self._apps = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['firebase'] = self
+
+    def get_app(self, name=DEFAULT_APP):
+        """Return the named Firebase app, initializing it on first use"""
+        firebase_app = self._apps.get(name)
+        if firebase_app is not None:
+            return firebase_app
+
+        with self._lock:
+            if name not in self._apps:
+                try:
+                    # Scripts may have initialized it themselves
+                    self._apps[name] = firebase_admin.get_app(name)
+                except ValueError:
+                    cred_file, options = _app_config(name)
+                    cred_path = os.path.join(FIREBASE_CREDENTIALS_DIR, cred_file)
+                    logger.debug(f"Initializing Firebase app {name} from {cred_path}")
+                    self._apps[name] = firebase_admin.initialize_app(
+                        credentials.Certificate(cred_path), options, name=name
+                    )
+            return self._apps[name]
+
+    def firestore(self):
+        """Return the Firestore client of the main app"""
+        return firestore.client(app=self.get_app())
+
+
+class _LazyFirestore:
+    """Module-level stand-in for a Firestore client that is only created on first attribute access"""
+
+    def __init__(self, clients):
+        self._clients = clients
+
+    def __getattr__(self, name):
+        return getattr(self._clients.firestore(), name)
+
+
+# Shared Firebase clients for the current worker process
+firebase = FirebaseClients()
+firestore_db = _LazyFirestore(firebase)
@@ -0,0 +1,310 @@
+import os
+import time
+import uuid
+import threading
+import logging
+from datetime import datetime, timezone
+from web3 import Web3
+from firebase_admin import db as rtdb
+from .firebase_clients import firebase
+from .project_catalog import project_catalog
+from .landing_stats import record_donation
+from .abi_bundle import load_event_topics
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# When enabled the indexer owns funds_raised and confirm_donation stops updating it
+FUNDING_INDEXER_ENABLED = os.getenv('FUNDING_INDEXER_ENABLED', 'false').lower() == 'true'
+FUNDING_INDEXER_INTERVAL = float(os.getenv('FUNDING_INDEXER_INTERVAL', '15'))
+# Public Avalanche RPC nodes reject eth_getLogs ranges over 2048 blocks
+FUNDING_INDEXER_BATCH_BLOCKS = int(os.getenv('FUNDING_INDEXER_BATCH_BLOCKS', '2048'))
+FUNDING_INDEXER_CONFIRMATIONS = int(os.getenv('FUNDING_INDEXER_CONFIRMATIONS', '1'))
+FUNDING_INDEXER_START_BLOCK = os.getenv('FUNDING_INDEXER_START_BLOCK')
+FUNDING_INDEXER_LEASE_TIMEOUT = float(os.getenv('FUNDING_INDEXER_LEASE_TIMEOUT', '120'))
+
+# Donors send amount plus the 0.5% platform fee; funds_raised tracks the amount alone
+PLATFORM_FEE_RATE = 0.005
+
+INDEXED_EVENTS = ('ContributionMade', 'ProjectFunded', 'FundsWithdrawn')
+
+_lease_token = f"{os.getpid()}-{uuid.uuid4().hex}"
+_thread = None
+_thread_lock = threading.Lock()
+
+
+class _LeaseHeld(Exception):
+    pass
+
+
+def _state_ref():
+    return rtdb.reference('indexer/funding_contract', app=firebase.get_app('rtdb'))
+
+
+def _unmatched_ref():
+    """ContributionMade events whose on-chain project ID wasn't mapped yet, by tx hash"""
+    return _state_ref().child('unmatched')
+
+
+def _event_topics():
+    """Map topic0 hash -> event name for the indexed events"""
+    return {
+        topic: name for topic, name in load_event_topics('FundingContract').items()
+        if name in INDEXED_EVENTS
+    }
+
+
+def normalize_tx_hash(value):
+    """Lowercase 0x-prefixed hash, also used as the contributions document ID"""
+    value = value.hex() if hasattr(value, 'hex') else str(value)
+    value = value.lower()
+    return value if value.startswith('0x') else '0x' + value
+
+
+def _acquire_lease():
+    """Make sure only one process indexes at a time"""
+    def apply(current):
+        if current and current.get('token') != _lease_token and \
+                time.time() - float(current.get('at', 0)) < FUNDING_INDEXER_LEASE_TIMEOUT:
+            raise _LeaseHeld()
+        return {'token': _lease_token, 'at': time.time()}
+
+    try:
+        _state_ref().child('lease').transaction(apply)
+        return True
+    except _LeaseHeld:
+        return False
+
+
+def _blockchain_id_map():
+    """Map on-chain project IDs to RTDB project keys"""
+    mapping = {}
+    for project_id, project in project_catalog.all().items():
+        blockchain_project_id = project.get('blockchain_project_id')
+        if blockchain_project_id is not None:
+            mapping[int(blockchain_project_id)] = project_id
+    return mapping
+
+
+def _add_funds(project_id, amounts):
+    """Add {tx_hash: amount} to a project's indexed total and return the amount actually added
+
+    The total and the applied hashes live together in indexer/funds/<id>, so replaying
+    a range never counts a contribution twice. funds_raised is then set from that total,
+    which also repairs a mirror write lost on an earlier run.
+    """
+    project_ref = rtdb.reference(f'projects/{project_id}', app=firebase.get_app('rtdb'))
+    applied = {}
+
+    def apply(current):
+        applied.clear()
+        if current is None:
+            # Start from what the project raised before the indexer owned funds_raised
+            current = {'base': float(project_ref.child('funds_raised').get() or 0), 'total': 0.0}
+        indexed = current.get('tx') or {}
+        new = {tx_hash: amount for tx_hash, amount in amounts.items() if tx_hash not in indexed}
+        if new:
+            current['total'] = float(current.get('total') or 0) + sum(new.values())
+            current['tx'] = dict(indexed, **new)
+            applied.update(new)
+        return current
+
+    funds = rtdb.reference(f'indexer/funds/{project_id}', app=firebase.get_app('rtdb')).transaction(apply)
+    raised = float(funds.get('base') or 0) + float(funds.get('total') or 0)
+    # Projects always carry funds_raised; a missing one means the project was deleted
+    project_ref.child('funds_raised').transaction(lambda current: raised if current is not None else None)
+    return sum(applied.values())
+
+
+def _apply_contributions(contributions, id_map):
+    """Record new ContributionMade events and add them to project totals exactly once"""
+    if not contributions:
+        return
+
+    db = firebase.firestore()
+    refs = {tx_hash: db.collection('contributions').document(tx_hash) for tx_hash in contributions}
+    existing = set()
+    already_indexed = set()
+    for snapshot in db.get_all(list(refs.values())):
+        if snapshot.exists:
+            existing.add(snapshot.id)
+            if snapshot.to_dict().get('chain_indexed'):
+                already_indexed.add(snapshot.id)
+
+    batch = db.batch()
+    amounts = {}  # project_id -> {tx_hash: amount}
+    unmatched = {}
+    for tx_hash, event in contributions.items():
+        if tx_hash in already_indexed:
+            continue
+
+        project_id = id_map.get(event['blockchain_project_id'])
+        if not project_id:
+            # The catalog may not know a just-confirmed project yet; park it for a later run
+            logger.warning(f"ContributionMade for unknown on-chain project {event['blockchain_project_id']}, parking {tx_hash}")
+            unmatched[tx_hash] = event
+            continue
+
+        gross = float(Web3.from_wei(event['amount'], 'ether'))
+        amount = gross / (1 + PLATFORM_FEE_RATE)
+
+        record = {
+            'chain_indexed': True,
+            'blockchain_project_id': event['blockchain_project_id'],
+            'contributor_address': event['contributor'],
+            'chain_amount': gross,
+            'block_number': event['block_number'],
+            'transaction_hash': tx_hash
+        }
+        if tx_hash not in existing:
+            # Contributions confirmed by the client already carry these fields
+            record.update({
+                'project_id': project_id,
+                'amount': amount,
+                'status': 'completed',
+                'timestamp': datetime.fromtimestamp(event['timestamp'], timezone.utc).isoformat()
+            })
+        batch.set(refs[tx_hash], record, merge=True)
+
+        amounts.setdefault(project_id, {})[tx_hash] = amount
+
+    # Totals go first: if marking the documents fails, the replayed range skips
+    # hashes already recorded in indexer/funds instead of losing their amounts
+    for project_id, project_amounts in amounts.items():
+        added = _add_funds(project_id, project_amounts)
+        project_catalog.invalidate(project_id)
+        if added:
+            record_donation(project_id, added, project_catalog.get(project_id))
+
+    batch.commit()
+
+    # Park unmatched events (amounts as strings, RTDB numbers are doubles) and clear applied ones
+    _unmatched_ref().update({
+        tx_hash: dict(event, amount=str(event['amount'])) if tx_hash in unmatched else None
+        for tx_hash, event in contributions.items()
+    })
+
+
+def _retry_unmatched():
+    """Apply parked contributions whose project has since appeared in the catalog"""
+    parked = _unmatched_ref().get()
+    if not parked:
+        return
+    id_map = _blockchain_id_map()
+    events = {
+        tx_hash: dict(event, amount=int(event['amount'])) for tx_hash, event in parked.items()
+        if event.get('blockchain_project_id') in id_map
+    }
+    if events:
+        logger.info(f"Applying {len(events)} parked contributions")
+        _apply_contributions(events, id_map)
+
+
+def _apply_status_events(events, id_map):
+    """Store ProjectFunded and FundsWithdrawn flags on the RTDB projects"""
+    projects_ref = rtdb.reference('projects', app=firebase.get_app('rtdb'))
+    for event in events:
+        project_id = id_map.get(event['blockchain_project_id'])
+        if not project_id:
+            continue
+        if event['name'] == 'ProjectFunded':
+            projects_ref.child(project_id).update({'funded': True})
+        else:
+            projects_ref.child(project_id).update({
+                'funds_withdrawn': float(Web3.from_wei(event['amount'], 'ether')),
+                'withdrawn_tx_hash': event['transaction_hash']
+            })
+        project_catalog.invalidate(project_id)
+
+
+def index_range(w3, contract, from_block, to_block):
+    """Fetch and apply every indexed event in [from_block, to_block] with one eth_getLogs call"""
+    topics = _event_topics()
+    logs = w3.eth.get_logs({
+        'address': contract.address,
+        'fromBlock': from_block,
+        'toBlock': to_block,
+        'topics': [list(topics)]
+    })
+
+    contributions = {}
+    status_events = []
+    for log in logs:
+        name = topics.get(normalize_tx_hash(log['topics'][0]))
+        if not name:
+            continue
+        args = getattr(contract.events, name)().process_log(log)['args']
+        tx_hash = normalize_tx_hash(log['transactionHash'])
+
+        if name == 'ContributionMade':
+            contributions[tx_hash] = {
+                'blockchain_project_id': int(args['projectId']),
+                'contributor': args['contributor'],
+                'amount': args['amount'],
+                'timestamp': args['timestamp'],
+                'block_number': log['blockNumber']
+            }
+        else:
+            status_events.append({
+                'name': name,
+                'blockchain_project_id': int(args['projectId']),
+                'amount': args.get('amount', args.get('totalAmount', 0)),
+                'transaction_hash': tx_hash
+            })
+
+    if contributions or status_events:
+        id_map = _blockchain_id_map()
+        _apply_contributions(contributions, id_map)
+        _apply_status_events(status_events, id_map)
+    return len(logs)
+
+
+def run_once():
+    """Index all confirmed blocks since the last checkpoint"""
+    from .web3_utils import web3_clients
+    w3 = web3_clients.w3
+    funding_contract = web3_clients.funding_contract
+
+    if not _acquire_lease():
+        return 0
+
+    _retry_unmatched()
+
+    head = w3.eth.block_number - FUNDING_INDEXER_CONFIRMATIONS
+    last_block = _state_ref().child('last_block').get()
+    if last_block is None:
+        last_block = int(FUNDING_INDEXER_START_BLOCK) - 1 if FUNDING_INDEXER_START_BLOCK else head
+
+    processed = 0
+    while last_block < head:
+        to_block = min(last_block + FUNDING_INDEXER_BATCH_BLOCKS, head)
+        processed += index_range(w3, funding_contract, last_block + 1, to_block)
+        last_block = to_block
+        _state_ref().update({
+            'last_block': last_block,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        })
+        _acquire_lease()
+
+    if processed:
+        logger.info(f"Funding indexer applied {processed} events up to block {last_block}")
+    return processed
+
+
+def start_funding_indexer(interval=FUNDING_INDEXER_INTERVAL):
+    """Start the background indexer thread once per process"""
+    global _thread
+
+    def monitor():
+        while True:
+            try:
+                run_once()
+            except Exception as e:
+                logger.error(f"Error in funding indexer: {str(e)}")
+            time.sleep(interval)
+
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=monitor, daemon=True)
+            _thread.start()
+    return _thread
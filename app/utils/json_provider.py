@@ -0,0 +1,88 @@
+import os
+import logging
+from datetime import date
+from decimal import Decimal
+from flask import current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Items serialized per chunk when streaming a JSON array
+JSON_STREAM_BATCH_SIZE = int(os.getenv('JSON_STREAM_BATCH_SIZE', '100'))
+
+
+def _default(value):
+    """Encode the non-JSON values routes produce the same way on both backends"""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return DefaultJSONProvider.default(value)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, falling back to the stdlib json module
+
+    Datetimes are written as ISO 8601 and Decimals as strings on both backends.
+    Keys are not sorted. Payloads orjson can't encode, such as integers above
+    64 bits, go through the stdlib encoder.
+    """
+
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def dumps_bytes(self, obj):
+        if orjson is None:
+            return self.dumps(obj).encode()
+        try:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits (wei amounts, uint256 tallies)
+            return super().dumps(obj).encode()
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def json_array_response(items, batch_size=JSON_STREAM_BATCH_SIZE):
+    """Stream an iterable as a JSON array instead of building the whole body in memory"""
+    provider = current_app.json
+    if isinstance(provider, FastJSONProvider):
+        encode = provider.dumps_bytes
+    else:
+        encode = lambda obj: provider.dumps(obj).encode()
+
+    def generate():
+        yield b'['
+        separator = b''
+        batch = []
+        for item in items:
+            batch.append(encode(item))
+            if len(batch) >= batch_size:
+                yield separator + b','.join(batch)
+                separator = b','
+                batch = []
+        if batch:
+            yield separator + b','.join(batch)
+        yield b']'
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=provider.mimetype)
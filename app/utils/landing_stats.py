@@ -0,0 +1,159 @@
+import os
+import time
+import heapq
+import logging
+from firebase_admin import db as rtdb
+from .firebase_clients import firebase
+from .project_catalog import project_catalog
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds before the maintained aggregate is rebuilt from the catalog to correct drift
+LANDING_STATS_RECOMPUTE_INTERVAL = float(os.getenv('LANDING_STATS_RECOMPUTE_INTERVAL', '3600'))
+
+FEATURED_COUNT = 3
+
+
+def _stats_ref():
+    return rtdb.reference('stats/landing', app=firebase.get_app('rtdb'))
+
+
+def _researchers_ref():
+    return rtdb.reference('stats/researchers', app=firebase.get_app('rtdb'))
+
+
+def _funding_progress(project):
+    goal_amount = float(project.get('goal_amount', 1)) or 1
+    return (float(project.get('funds_raised', 0)) / goal_amount) * 100
+
+
+def _featured_entry(project_id, project):
+    """Card fields the landing page needs for a featured project"""
+    return {
+        'id': project_id,
+        'title': project.get('title'),
+        'funds_raised': float(project.get('funds_raised', 0)),
+        'goal_amount': float(project.get('goal_amount', 1)),
+        'funding_progress': _funding_progress(project)
+    }
+
+
+def _merge_featured(featured, project_id, project):
+    """Replace project_id in the featured list and keep the top entries by progress"""
+    featured = [entry for entry in (featured or []) if entry.get('id') != project_id]
+    if project and project.get('status') == 'active':
+        featured.append(_featured_entry(project_id, project))
+    featured.sort(key=lambda x: x['funding_progress'], reverse=True)
+    return featured[:FEATURED_COUNT]
+
+
+def recompute_landing_stats():
+    """Rebuild the landing aggregate from the full project catalog"""
+    all_projects = project_catalog.all()
+
+    researcher_counts = {}
+    active_projects = 0
+    total_eth = 0.0
+    active = []
+    for project_id, project in all_projects.items():
+        total_eth += float(project.get('funds_raised', 0))
+        if project.get('status') == 'active':
+            active_projects += 1
+            active.append((project_id, project))
+
+        members = [project.get('created_by')] + list(project.get('team_members', []) or [])
+        for uid in set(members):
+            if uid:
+                researcher_counts[uid] = researcher_counts.get(uid, 0) + 1
+
+    # Only the top few are kept, so select them with a heap instead of sorting every project
+    featured = [
+        _featured_entry(project_id, project)
+        for project_id, project in heapq.nlargest(FEATURED_COUNT, active, key=lambda item: _funding_progress(item[1]))
+    ]
+
+    stats = {
+        'total_projects': active_projects,
+        'total_eth': total_eth,
+        'total_researchers': len(researcher_counts),
+        'featured': featured,
+        'computed_at': time.time()
+    }
+    _researchers_ref().set(researcher_counts)
+    _stats_ref().set(stats)
+    logger.info(f"Recomputed landing stats over {len(all_projects)} projects")
+    return stats
+
+
+def get_landing_stats():
+    """Return the landing aggregate with a single small read, rebuilding it when missing or stale"""
+    stats = _stats_ref().get()
+    if not stats or time.time() - float(stats.get('computed_at', 0)) > LANDING_STATS_RECOMPUTE_INTERVAL:
+        stats = recompute_landing_stats()
+
+    return {
+        'total_projects': stats.get('total_projects', 0),
+        'total_eth': round(float(stats.get('total_eth', 0)), 2),
+        'total_researchers': stats.get('total_researchers', 0)
+    }, list(stats.get('featured', []) or [])
+
+
+def record_project_created(project_id, project):
+    """Count a newly created active project and its researchers"""
+    try:
+        new_researchers = 0
+        members = [project.get('created_by')] + list(project.get('team_members', []) or [])
+        for uid in set(members):
+            if not uid:
+                continue
+            count = _researchers_ref().child(uid).transaction(lambda current: (current or 0) + 1)
+            if count == 1:
+                new_researchers += 1
+
+        def apply(current):
+            if not current:
+                return current
+            current['total_projects'] = current.get('total_projects', 0) + 1
+            current['total_researchers'] = current.get('total_researchers', 0) + new_researchers
+            current['featured'] = _merge_featured(current.get('featured'), project_id, project)
+            return current
+
+        _stats_ref().transaction(apply)
+    except Exception as e:
+        logger.error(f"Error updating landing stats for new project {project_id}: {str(e)}")
+
+
+def record_donation(project_id, amount, project=None):
+    """Add a confirmed donation to the running totals"""
+    try:
+        def apply(current):
+            if not current:
+                return current
+            current['total_eth'] = float(current.get('total_eth', 0)) + float(amount)
+            if project is not None:
+                current['featured'] = _merge_featured(current.get('featured'), project_id, project)
+            return current
+
+        _stats_ref().transaction(apply)
+    except Exception as e:
+        logger.error(f"Error updating landing stats for donation to {project_id}: {str(e)}")
+
+
+def record_project_deactivated(project_id):
+    """Remove a deactivated project from the active count and featured list"""
+    try:
+        def apply(current):
+            if not current:
+                return current
+            current['total_projects'] = max(0, current.get('total_projects', 0) - 1)
+            featured = current.get('featured') or []
+            if any(entry.get('id') == project_id for entry in featured):
+                # The replacement is unknown here, so let the next read rebuild the aggregate
+                current['featured'] = [entry for entry in featured if entry.get('id') != project_id]
+                current['computed_at'] = 0
+            return current
+
+        _stats_ref().transaction(apply)
+    except Exception as e:
+        logger.error(f"Error updating landing stats for deactivated project {project_id}: {str(e)}")
@@ -0,0 +1,87 @@
+import os
+import logging
+from web3 import Web3
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on Avalanche C-Chain and Fuji
+MULTICALL_ADDRESS = os.getenv('MULTICALL_ADDRESS', '0xcA11bde05977b3631167028862bE2a173976CA11')
+
+# Calls packed into one aggregate3 eth_call, to stay under node gas caps
+MULTICALL_CHUNK_SIZE = int(os.getenv('MULTICALL_CHUNK_SIZE', '300'))
+
+MULTICALL_ABI = [{
+    'inputs': [{
+        'components': [
+            {'internalType': 'address', 'name': 'target', 'type': 'address'},
+            {'internalType': 'bool', 'name': 'allowFailure', 'type': 'bool'},
+            {'internalType': 'bytes', 'name': 'callData', 'type': 'bytes'}
+        ],
+        'internalType': 'struct Multicall3.Call3[]',
+        'name': 'calls',
+        'type': 'tuple[]'
+    }],
+    'name': 'aggregate3',
+    'outputs': [{
+        'components': [
+            {'internalType': 'bool', 'name': 'success', 'type': 'bool'},
+            {'internalType': 'bytes', 'name': 'returnData', 'type': 'bytes'}
+        ],
+        'internalType': 'struct Multicall3.Result[]',
+        'name': 'returnData',
+        'type': 'tuple[]'
+    }],
+    'stateMutability': 'payable',
+    'type': 'function'
+}]
+
+
+def _output_types(function):
+    return [output['type'] for output in function.abi['outputs']]
+
+
+class Multicall:
+    """Runs many read-only contract calls through Multicall3 aggregate3"""
+
+    def __init__(self, w3, address=MULTICALL_ADDRESS, chunk_size=MULTICALL_CHUNK_SIZE):
+        self.w3 = w3
+        self.chunk_size = chunk_size
+        self.contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=MULTICALL_ABI) if address else None
+
+    def call(self, functions):
+        """Return decoded results for bound contract functions, with None for reverted calls
+
+        Single-value outputs are unwrapped; multi-value outputs are returned as tuples.
+        """
+        if not functions:
+            return []
+        if self.contract is None:
+            return [self._call_one(function) for function in functions]
+
+        results = []
+        for start in range(0, len(functions), self.chunk_size):
+            chunk = functions[start:start + self.chunk_size]
+            calls = [(function.address, True, function._encode_transaction_data()) for function in chunk]
+            try:
+                responses = self.contract.functions.aggregate3(calls).call()
+            except Exception as e:
+                logger.error(f"Multicall failed, falling back to single calls: {str(e)}")
+                results.extend(self._call_one(function) for function in chunk)
+                continue
+
+            for function, (success, data) in zip(chunk, responses):
+                if not success:
+                    results.append(None)
+                    continue
+                decoded = self.w3.codec.decode(_output_types(function), data)
+                results.append(decoded[0] if len(decoded) == 1 else tuple(decoded))
+        return results
+
+    def _call_one(self, function):
+        try:
+            result = function.call()
+        except Exception as e:
+            logger.debug(f"Call to {function.fn_name} reverted: {str(e)}")
+            return None
+        return tuple(result) if isinstance(result, list) and len(_output_types(function)) > 1 else result
@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the chain's pending nonce while allocating locally
+NONCE_RESYNC_INTERVAL = float(os.getenv('NONCE_RESYNC_INTERVAL', '30'))
+# Sends tried per transaction when another process took the same nonce
+NONCE_SEND_ATTEMPTS = int(os.getenv('NONCE_SEND_ATTEMPTS', '3'))
+
+# Node error fragments that mean our local nonce is out of step with the chain
+_NONCE_ERRORS = (
+    'nonce too low',
+    'nonce too high',
+    'already known',
+    'replacement transaction underpriced',
+    'invalid nonce'
+)
+# The node already holds this exact signed transaction, so sending it again under a new nonce would duplicate it
+_ALREADY_SENT = 'already known'
+
+
+def is_nonce_error(error):
+    """Return True if a send failure was caused by a stale nonce"""
+    message = str(error).lower()
+    return any(fragment in message for fragment in _NONCE_ERRORS)
+
+
+class NonceManager:
+    """Hands out sequential nonces for one sending address without a chain read per transaction"""
+
+    def __init__(self, w3, address, resync_interval=NONCE_RESYNC_INTERVAL):
+        self.w3 = w3
+        self.address = address
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._next = None
+        self._pid = None
+        self._synced_at = 0.0
+        self._in_flight = set()
+
+    def _chain_nonce(self):
+        return self.w3.eth.get_transaction_count(self.address, 'pending')
+
+    def _resync(self):
+        self._next = self._chain_nonce()
+        self._pid = os.getpid()
+        self._synced_at = time.monotonic()
+        self._in_flight.clear()
+        logger.info(f"Nonce for {self.address} synced to {self._next}")
+
+    def _check_gap(self):
+        """Move forward if transactions were sent from this address outside this process"""
+        chain_nonce = self._chain_nonce()
+        self._synced_at = time.monotonic()
+        if chain_nonce > self._next:
+            logger.warning(f"Nonce gap for {self.address}: local {self._next}, chain {chain_nonce}")
+            self._next = chain_nonce
+
+    def allocate(self):
+        """Return the next nonce to use"""
+        with self._lock:
+            # A forked worker must not reuse the parent's counter
+            if self._next is None or self._pid != os.getpid():
+                self._resync()
+            elif not self._in_flight and time.monotonic() - self._synced_at > self.resync_interval:
+                self._check_gap()
+
+            nonce = self._next
+            self._next += 1
+            self._in_flight.add(nonce)
+            return nonce
+
+    def confirm(self, nonce):
+        """Mark a nonce as accepted by the node"""
+        with self._lock:
+            self._in_flight.discard(nonce)
+
+    def release(self, nonce, error=None):
+        """Give back a nonce whose transaction was never accepted"""
+        with self._lock:
+            self._in_flight.discard(nonce)
+            if error is not None and is_nonce_error(error):
+                self._next = None
+            elif nonce == self._next - 1:
+                self._next = nonce
+            else:
+                # Later nonces are already out, so this one left a hole; start over from the chain
+                logger.warning(f"Nonce {nonce} for {self.address} released out of order, resyncing")
+                self._next = None
+
+    def reset(self):
+        """Force the next allocation to read the nonce from the chain"""
+        with self._lock:
+            self._next = None
+
+    @contextmanager
+    def reserve(self):
+        """Allocate a nonce for the enclosed send and release it if the send raises"""
+        nonce = self.allocate()
+        try:
+            yield nonce
+        except Exception as e:
+            self.release(nonce, e)
+            raise
+        else:
+            self.confirm(nonce)
+
+    def send(self, send_with_nonce, attempts=NONCE_SEND_ATTEMPTS):
+        """Return send_with_nonce(nonce), retrying with a resynced nonce after a stale-nonce error
+
+        Every worker process has its own manager for the same address, so collisions still happen.
+        """
+        for attempt in range(attempts):
+            try:
+                with self.reserve() as nonce:
+                    return send_with_nonce(nonce)
+            except Exception as e:
+                if attempt + 1 >= attempts or not is_nonce_error(e) or _ALREADY_SENT in str(e).lower():
+                    raise
+                logger.warning(f"Nonce collision for {self.address} ({str(e)}), retrying")
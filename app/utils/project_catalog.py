@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from firebase_admin import db as rtdb
+from .records import ProjectRecord
+from .firebase_clients import firebase
+from .rtdb_pages import cursor_page
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds a loaded catalog stays warm before the next read refreshes it
+PROJECT_CATALOG_TTL = float(os.getenv('PROJECT_CATALOG_TTL', '30'))
+
+
+def _digest(project_id, project):
+    """64-bit content hash of one project; XOR-ed together these form the catalog version"""
+    payload = json.dumps(project, sort_keys=True, default=str, separators=(',', ':'))
+    return int.from_bytes(hashlib.blake2b(f'{project_id}\0{payload}'.encode(), digest_size=8).digest(), 'big')
+
+
+class ProjectCatalog:
+    """In-process copy of the RTDB `projects` tree shared by all requests of a worker"""
+
+    def __init__(self, ttl=PROJECT_CATALOG_TTL):
+        self.ttl = ttl
+        self._projects = None
+        self._loaded_at = 0.0
+        self._digests = {}
+        self._checksum = 0
+        self._listeners = []
+        self._lock = threading.RLock()
+
+    def _reference(self):
+        return rtdb.reference('projects', app=firebase.get_app('rtdb'))
+
+    def _is_fresh(self):
+        return self._projects is not None and (time.monotonic() - self._loaded_at) < self.ttl
+
+    def _load(self):
+        """Download the full project tree and replace the cached copy if it changed"""
+        all_projects = self._reference().get() or {}
+        digests = {
+            pid: _digest(pid, data) for pid, data in all_projects.items()
+            if data and isinstance(data, dict)
+        }
+        checksum = 0
+        for value in digests.values():
+            checksum ^= value
+        self._loaded_at = time.monotonic()
+        if self._projects is not None and checksum == self._checksum and digests == self._digests:
+            logger.debug("Project catalog reloaded unchanged")
+            return
+
+        # Timestamps are parsed here once instead of on every request
+        self._projects = {pid: ProjectRecord(all_projects[pid]) for pid in digests}
+        self._digests = digests
+        self._checksum = checksum
+        logger.debug(f"Project catalog loaded with {len(self._projects)} projects")
+        self._notify('rebuild', self._projects)
+
+    def _store(self, project_id, project):
+        """Put one project (or None to remove it) into the loaded catalog and update the version"""
+        self._checksum ^= self._digests.pop(project_id, 0)
+        if project is None:
+            self._projects.pop(project_id, None)
+        else:
+            self._projects[project_id] = project
+            self._digests[project_id] = _digest(project_id, project)
+            self._checksum ^= self._digests[project_id]
+        self._notify('update', project_id, project)
+
+    def _drop(self):
+        self._projects = None
+        self._loaded_at = 0.0
+
+    def _notify(self, method, *args):
+        for listener in self._listeners:
+            try:
+                getattr(listener, method)(*args)
+            except Exception as e:
+                logger.error(f"Error updating catalog listener {type(listener).__name__}: {str(e)}")
+
+    def subscribe(self, listener):
+        """Keep a derived index in sync through its rebuild(projects) and update(project_id, project) hooks
+
+        Hooks run under the catalog lock and must not block on network I/O.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            if self._projects is not None:
+                listener.rebuild(self._projects)
+
+    def ensure_loaded(self):
+        """Load the catalog if it is empty or older than the TTL"""
+        if self._is_fresh():
+            return
+        with self._lock:
+            if not self._is_fresh():
+                self._load()
+
+    @property
+    def version(self):
+        """Content hash of the cached catalog, the same in every worker holding the same data"""
+        with self._lock:
+            return f'{self._checksum:016x}'
+
+    def all(self):
+        """Return {project_id: ProjectRecord} with a shallow copy of every project"""
+        self.ensure_loaded()
+        with self._lock:
+            return {pid: data.copy() for pid, data in self._projects.items()}
+
+    def get(self, project_id):
+        """Return a shallow copy of a single project or None"""
+        self.ensure_loaded()
+        with self._lock:
+            project = self._projects.get(project_id)
+            return project.copy() if project is not None else None
+
+    def get_many(self, project_ids, load=True):
+        """Return shallow copies of the given projects in order, skipping unknown ids
+
+        With load=False a cold catalog is not downloaded; each project is read on its own instead.
+        """
+        if load:
+            self.ensure_loaded()
+        elif not self._is_fresh():
+            projects = []
+            for pid in project_ids:
+                data = self._reference().child(pid).get()
+                if data and isinstance(data, dict):
+                    project = ProjectRecord(data)
+                    project['id'] = pid
+                    projects.append(project)
+            return projects
+
+        with self._lock:
+            projects = []
+            for pid in project_ids:
+                project = self._projects.get(pid)
+                if project is not None:
+                    project = project.copy()
+                    project['id'] = pid
+                    projects.append(project)
+            return projects
+
+    def page(self, after=None, limit=4):
+        """Return (projects, next_cursor) for one page of projects in key order"""
+        return cursor_page(self._reference(), lambda pid, data: ProjectRecord(data, id=pid), after=after, limit=limit)
+
+    def patch(self, project_id, fields):
+        """Apply fields we just wrote to the cached project without reading it back"""
+        with self._lock:
+            if self._projects is None or project_id not in self._projects:
+                return
+            self._store(project_id, ProjectRecord(self._projects[project_id], **fields))
+
+    def invalidate(self, project_id=None):
+        """Drop the catalog, or refresh a single project after a write"""
+        with self._lock:
+            if project_id is None or self._projects is None:
+                self._drop()
+                return
+
+        # Read outside the lock so catalog readers don't wait on the round trip
+        try:
+            data = self._reference().child(project_id).get()
+        except Exception as e:
+            logger.error(f"Error refreshing project {project_id} in catalog: {str(e)}")
+            with self._lock:
+                self._drop()
+            return
+
+        data = ProjectRecord(data) if data and isinstance(data, dict) else None
+        with self._lock:
+            if self._projects is None:
+                # Dropped meanwhile; the next read reloads everything
+                return
+            self._store(project_id, data)
+
+
+# Shared catalog for the current worker process
+project_catalog = ProjectCatalog()
@@ -0,0 +1,128 @@
+import queue
+import threading
+import logging
+from firebase_admin import db as rtdb
+from .firebase_clients import firebase
+from .rtdb_pages import cursor_page
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Fields a project card needs; everything else stays in `projects`
+SUMMARY_FIELDS = (
+    'title',
+    'goal_amount',
+    'funds_raised',
+    'upvotes',
+    'downvotes',
+    'status',
+    'created_at',
+    'created_by',
+    'creator_name'
+)
+# Cards show at most 200 characters of the description
+SUMMARY_DESCRIPTION_LENGTH = 200
+
+
+def summarize(project):
+    """Return the card fields of a project, keeping its 'id' if present"""
+    summary = {
+        field: project[field] for field in SUMMARY_FIELDS
+        if project.get(field) is not None
+    }
+    summary['description'] = (project.get('description') or '')[:SUMMARY_DESCRIPTION_LENGTH]
+    if 'id' in project:
+        summary['id'] = project['id']
+    return summary
+
+
+class ProjectSummaries:
+    """Keeps the RTDB `project_summaries` projection in step with the project catalog
+
+    Catalog hooks run under the catalog lock, so they only compute summaries and
+    queue them; a background thread does the RTDB reads and writes in order.
+    """
+
+    def __init__(self):
+        self._written = None  # project_id -> summary last seen in RTDB
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _reference(self):
+        return rtdb.reference('project_summaries', app=firebase.get_app('rtdb'))
+
+    def _enqueue(self, *write):
+        self._queue.put(write)
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, daemon=True)
+                self._thread.start()
+
+    def _writer(self):
+        while True:
+            method, *args = self._queue.get()
+            try:
+                method(*args)
+            except Exception as e:
+                logger.error(f"Error writing project summaries: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Block until every queued summary write has been applied"""
+        self._queue.join()
+
+    def rebuild(self, projects):
+        """Queue a write of the summaries that differ from the stored projection"""
+        summaries = {project_id: summarize(project) for project_id, project in projects.items()}
+        self._enqueue(self._write_all, summaries)
+
+    def update(self, project_id, project):
+        """Queue a refresh of one summary after its project was written"""
+        self._enqueue(self._write_one, project_id, summarize(project) if project else None)
+
+    def _write_all(self, summaries):
+        with self._lock:
+            if self._written is None:
+                self._written = self._reference().get() or {}
+
+            updates = {
+                project_id: summary for project_id, summary in summaries.items()
+                if self._written.get(project_id) != summary
+            }
+            for project_id in set(self._written) - set(summaries):
+                updates[project_id] = None
+
+            if updates:
+                self._reference().update(updates)
+                for project_id, summary in updates.items():
+                    if summary is None:
+                        self._written.pop(project_id, None)
+                    else:
+                        self._written[project_id] = summary
+                logger.info(f"Updated {len(updates)} project summaries")
+
+    def _write_one(self, project_id, summary):
+        with self._lock:
+            if self._written is not None:
+                if self._written.get(project_id) == summary:
+                    return
+                if summary is None:
+                    self._written.pop(project_id, None)
+                else:
+                    self._written[project_id] = summary
+
+        if summary is None:
+            self._reference().child(project_id).delete()
+        else:
+            self._reference().child(project_id).set(summary)
+
+    def page(self, after=None, limit=4):
+        """Return (summaries, next_cursor) for one page in key order"""
+        return cursor_page(self._reference(), lambda project_id, data: dict(data, id=project_id), after=after, limit=limit)
+
+
+# Shared projection writer for the current worker process
+project_summaries = ProjectSummaries()
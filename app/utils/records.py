@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+
+# Project fields stored as ISO 8601 strings
+TIMESTAMP_FIELDS = ('created_at', 'last_updated', 'deadline')
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso(value):
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    # Naive values were written with utcnow()
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_timestamp(value):
+    """Return a timezone-aware datetime for an ISO string or datetime, or None if it can't be parsed"""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return _parse_iso(value)
+    except ValueError:
+        return None
+
+
+class ProjectRecord(dict):
+    """Project dict whose timestamps are parsed once when the record is built
+
+    The stored fields keep their original strings; parsed values live on attributes
+    (created_at_dt, last_updated_dt, deadline_dt) next to an epoch sort key (created_ts).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at_dt = parse_timestamp(self.get('created_at'))
+        self.last_updated_dt = parse_timestamp(self.get('last_updated'))
+        self.deadline_dt = parse_timestamp(self.get('deadline'))
+        self.created_ts = self.created_at_dt.timestamp() if self.created_at_dt else 0.0
+
+    def copy(self):
+        record = dict.__new__(ProjectRecord)
+        dict.update(record, self)
+        record.__dict__.update(self.__dict__)
+        return record
+
+    def with_datetimes(self):
+        """Return a copy with the timestamp fields replaced by their datetimes, for templates"""
+        record = self.copy()
+        for field in TIMESTAMP_FIELDS:
+            value = getattr(self, f'{field}_dt')
+            if value is not None:
+                record[field] = value
+        return record
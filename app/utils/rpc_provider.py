@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from web3.providers import JSONBaseProvider
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Keep-alive connections per RPC host; should cover the worker's threads
+RPC_POOL_SIZE = int(os.getenv('RPC_POOL_SIZE', '16'))
+# Seconds to connect / wait for a response before giving up on a node
+RPC_CONNECT_TIMEOUT = float(os.getenv('RPC_CONNECT_TIMEOUT', '3'))
+RPC_READ_TIMEOUT = float(os.getenv('RPC_READ_TIMEOUT', '10'))
+RPC_RETRIES = int(os.getenv('RPC_RETRIES', '3'))
+RPC_BACKOFF = float(os.getenv('RPC_BACKOFF', '0.25'))
+
+# Read-only calls that are safe to repeat or send to another node
+IDEMPOTENT_METHODS = frozenset((
+    'eth_blockNumber',
+    'eth_call',
+    'eth_chainId',
+    'eth_estimateGas',
+    'eth_feeHistory',
+    'eth_gasPrice',
+    'eth_getBalance',
+    'eth_getBlockByHash',
+    'eth_getBlockByNumber',
+    'eth_getCode',
+    'eth_getLogs',
+    'eth_getTransactionByHash',
+    'eth_getTransactionCount',
+    'eth_getTransactionReceipt',
+    'eth_maxPriorityFeePerGas',
+    'net_version',
+    'web3_clientVersion'
+))
+
+_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def rpc_urls(primary=None):
+    """RPC endpoints from RPC_URLS (comma separated), falling back to the primary URL"""
+    urls = [url.strip() for url in os.getenv('RPC_URLS', '').split(',') if url.strip()]
+    if primary and primary not in urls:
+        urls.insert(0, primary)
+    return urls
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """JSON-RPC over one keep-alive session, retrying reads with backoff and failing over across nodes"""
+
+    def __init__(self, endpoint_uris, pool_size=RPC_POOL_SIZE, timeout=(RPC_CONNECT_TIMEOUT, RPC_READ_TIMEOUT),
+                 retries=RPC_RETRIES, backoff=RPC_BACKOFF):
+        super().__init__()
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoint_uris = list(endpoint_uris)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._active = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.endpoint_uris), pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+    @property
+    def endpoint_uri(self):
+        return self.endpoint_uris[self._active]
+
+    def __str__(self):
+        return f"RPC connection {self.endpoint_uri}"
+
+    def _post(self, payload, idempotent):
+        """Send a payload to the active node, moving to the next one when it can't be reached"""
+        attempts = self.retries + 1 if idempotent else 1
+        last_error = None
+        for attempt in range(attempts):
+            start = self._active
+            for offset in range(len(self.endpoint_uris)):
+                index = (start + offset) % len(self.endpoint_uris)
+                uri = self.endpoint_uris[index]
+                try:
+                    response = self.session.post(uri, data=payload, timeout=self.timeout)
+                    if idempotent and response.status_code in _RETRY_STATUS_CODES:
+                        raise requests.HTTPError(f"{response.status_code} from {uri}", response=response)
+                    response.raise_for_status()
+                except requests.ConnectionError as e:
+                    # The request never reached the node, so any method may go elsewhere
+                    last_error = e
+                except (requests.Timeout, requests.HTTPError) as e:
+                    if not idempotent:
+                        raise
+                    last_error = e
+                else:
+                    if index != self._active:
+                        logger.warning(f"RPC failover from {self.endpoint_uris[self._active]} to {uri}")
+                        self._active = index
+                    return response.content
+                logger.warning(f"RPC request to {uri} failed: {str(last_error)}")
+
+            if attempt + 1 < attempts:
+                time.sleep(self.backoff * (2 ** attempt))
+        raise last_error
+
+    def make_request(self, method, params):
+        raw_response = self._post(self.encode_rpc_request(method, params), method in IDEMPOTENT_METHODS)
+        return self.decode_rpc_response(raw_response)
+
+    def make_batch(self, calls):
+        """Send [(method, params), ...] as one JSON-RPC batch and return the raw responses in call order"""
+        payloads = [self.encode_rpc_request(method, params) for method, params in calls]
+        request_ids = [json.loads(payload)['id'] for payload in payloads]
+        idempotent = all(method in IDEMPOTENT_METHODS for method, _ in calls)
+
+        responses = json.loads(self._post(b'[' + b','.join(payloads) + b']', idempotent))
+        if isinstance(responses, dict):
+            # Nodes answer a rejected batch with a single error object
+            raise ValueError(f"RPC batch rejected: {responses.get('error')}")
+        by_id = {response.get('id'): response for response in responses}
+        return [by_id.get(request_id, {'error': {'message': 'No response in batch'}}) for request_id in request_ids]
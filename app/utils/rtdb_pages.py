@@ -0,0 +1,17 @@
+def cursor_page(reference, make_row, after=None, limit=4):
+    """Return (rows, next_cursor) for one page of an RTDB node's children in key order
+
+    make_row(key, data) builds each returned row; pass the last key as `after` to get the next page.
+    """
+    query = reference.order_by_key()
+    if after:
+        # start_at is inclusive, so fetch one extra row and drop the cursor itself
+        children = query.start_at(after).limit_to_first(limit + 2).get() or {}
+        children.pop(after, None)
+    else:
+        children = query.limit_to_first(limit + 1).get() or {}
+
+    keys = sorted(key for key, data in children.items() if data and isinstance(data, dict))
+    rows = [make_row(key, children[key]) for key in keys[:limit]]
+    next_cursor = keys[limit - 1] if len(keys) > limit else None
+    return rows, next_cursor
@@ -0,0 +1,182 @@
+import os
+import re
+import math
+import bisect
+import threading
+from collections import defaultdict
+
+# Results per /search-projects page when the client doesn't pass a limit
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', '24'))
+
+# Relative weight of a token hit per indexed field
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'description': 1.0,
+    'citations': 1.0
+}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric tokens, ignoring HTML tags"""
+    if not text or not isinstance(text, str):
+        return []
+    return _TOKEN_RE.findall(_TAG_RE.sub(' ', text).lower())
+
+
+def _goal_amount(project):
+    try:
+        return float(project.get('goal_amount', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ProjectSearchIndex:
+    """Inverted index over project title, description and citations"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = defaultdict(dict)  # token -> {project_id: weight}
+        self._doc_tokens = {}               # project_id -> set of tokens
+        self._status = defaultdict(set)     # status -> {project_id}
+        self._goals = {}                    # project_id -> goal amount
+        self._vocabulary = []
+        self._goal_order = []
+        self._vocabulary_dirty = False
+        self._goal_order_dirty = False
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def rebuild(self, projects):
+        """Index every project from a {project_id: project} mapping"""
+        with self._lock:
+            self._reset()
+            for project_id, project in projects.items():
+                self._add(project_id, project)
+
+    def update(self, project_id, project):
+        """Re-index a single project, or drop it when project is None"""
+        with self._lock:
+            self._remove(project_id)
+            if project:
+                self._add(project_id, project)
+
+    def _add(self, project_id, project):
+        weights = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(project.get(field)):
+                weights[token] += weight
+
+        for token, weight in weights.items():
+            if token not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[token][project_id] = weight
+
+        self._doc_tokens[project_id] = set(weights)
+        self._status[project.get('status')].add(project_id)
+        self._goals[project_id] = _goal_amount(project)
+        self._goal_order_dirty = True
+
+    def _remove(self, project_id):
+        tokens = self._doc_tokens.pop(project_id, None)
+        if tokens is None:
+            return
+
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(project_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+        for members in self._status.values():
+            members.discard(project_id)
+        self._goals.pop(project_id, None)
+        self._goal_order_dirty = True
+
+    def _expand_prefix(self, prefix):
+        """Return every indexed token starting with prefix"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        tokens = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            tokens.append(token)
+        return tokens
+
+    def _goal_range(self, min_goal, max_goal):
+        """Return the ids of projects whose goal falls in [min_goal, max_goal]"""
+        if self._goal_order_dirty:
+            self._goal_order = sorted((goal, pid) for pid, goal in self._goals.items())
+            self._goal_order_dirty = False
+
+        lo = 0
+        if min_goal:
+            lo = bisect.bisect_left(self._goal_order, (min_goal,))
+        hi = len(self._goal_order)
+        if max_goal:
+            hi = bisect.bisect_right(self._goal_order, (max_goal, chr(0x10FFFF)))
+        return {pid for _, pid in self._goal_order[lo:hi]}
+
+    def search(self, query='', status=None, min_goal=None, max_goal=None, prefix=True):
+        """Return project ids matching every query term, best match first
+
+        The last query term also matches as a prefix so results update while typing.
+        """
+        with self._lock:
+            candidates = None
+            if status:
+                candidates = set(self._status.get(status, ()))
+            if min_goal or max_goal:
+                in_range = self._goal_range(min_goal, max_goal)
+                candidates = in_range if candidates is None else candidates & in_range
+
+            terms = tokenize(query)
+            if not terms:
+                if candidates is None:
+                    candidates = set(self._doc_tokens)
+                return sorted(candidates)
+
+            total = len(self._doc_tokens) or 1
+            scores = None
+            for position, term in enumerate(terms):
+                if prefix and position == len(terms) - 1:
+                    expanded = self._expand_prefix(term)
+                else:
+                    expanded = [term] if term in self._postings else []
+
+                # Later terms only need to score projects that matched so far
+                allowed = candidates if scores is None else scores
+                term_scores = defaultdict(float)
+                for token in expanded:
+                    postings = self._postings[token]
+                    idf = math.log(1 + total / len(postings))
+                    for pid, weight in postings.items():
+                        if allowed is None or pid in allowed:
+                            term_scores[pid] += weight * idf
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {pid: score + term_scores[pid]
+                              for pid, score in scores.items() if pid in term_scores}
+                if not scores:
+                    return []
+
+            return sorted(scores, key=lambda pid: (-scores[pid], pid))
+
+
+# Shared search index for the current worker process
+search_index = ProjectSearchIndex()
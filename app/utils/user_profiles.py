@@ -0,0 +1,55 @@
+import os
+import logging
+from .ttl_cache import TTLCache, MISSING
+from .firebase_clients import firebase
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched profile may be served from memory
+USER_PROFILE_TTL = float(os.getenv('USER_PROFILE_TTL', '60'))
+USER_PROFILE_CACHE_SIZE = int(os.getenv('USER_PROFILE_CACHE_SIZE', '5000'))
+
+
+class UserProfileCache:
+    """Short-lived per-uid cache of Firestore `users` documents with batched misses"""
+
+    def __init__(self, ttl=USER_PROFILE_TTL, max_size=USER_PROFILE_CACHE_SIZE):
+        self._cache = TTLCache(ttl, max_size)
+
+    def get_many(self, uids):
+        """Return {uid: profile dict or None}, fetching every miss in one get_all call"""
+        results = {}
+        missing = []
+        for uid in dict.fromkeys(uid for uid in uids if uid):
+            profile = self._cache.get(uid)
+            if profile is MISSING:
+                missing.append(uid)
+            else:
+                results[uid] = dict(profile) if profile is not None else None
+
+        if missing:
+            db = firebase.firestore()
+            refs = [db.collection('users').document(uid) for uid in missing]
+            fetched = {uid: None for uid in missing}
+            for snapshot in db.get_all(refs):
+                if snapshot.exists:
+                    fetched[snapshot.id] = snapshot.to_dict()
+
+            for uid, profile in fetched.items():
+                self._cache.set(uid, profile)
+                results[uid] = dict(profile) if profile is not None else None
+
+        return results
+
+    def get(self, uid):
+        """Return a single profile dict or None"""
+        return self.get_many([uid]).get(uid)
+
+    def invalidate(self, uid):
+        """Forget a profile after the user document changes"""
+        self._cache.pop(uid)
+
+
+# Shared profile cache for the current worker process
+user_profiles = UserProfileCache()
@@ -0,0 +1,67 @@
+import threading
+import logging
+from firebase_admin import db as rtdb
+from .firebase_clients import firebase
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+# Users whose index this process has seen backfilled
+_backfilled = set()
+_backfilled_lock = threading.Lock()
+
+
+def _index_ref(uid):
+    return rtdb.reference(f'user_projects/{uid}', app=firebase.get_app('rtdb'))
+
+
+def _marker_ref(uid):
+    return rtdb.reference(f'user_projects_backfilled/{uid}', app=firebase.get_app('rtdb'))
+
+
+def add_user_project(uid, project_id, created_at):
+    """Record a project in its creator's index"""
+    try:
+        _index_ref(uid).child(project_id).set(created_at or '')
+    except Exception as e:
+        logger.error(f"Error indexing project {project_id} for user {uid}: {str(e)}")
+
+
+def _backfill(uid):
+    """Merge the user's projects that predate the index into it
+
+    Needs ".indexOn": ["created_by"] on /projects in the RTDB rules.
+    """
+    projects = rtdb.reference('projects', app=firebase.get_app('rtdb')) \
+        .order_by_child('created_by').equal_to(uid).get() or {}
+    entries = {
+        project_id: project.get('created_at') or ''
+        for project_id, project in projects.items()
+        if project and isinstance(project, dict)
+    }
+    if entries:
+        # update keeps projects indexed by add_user_project since the query ran
+        _index_ref(uid).update(entries)
+        logger.info(f"Backfilled {len(entries)} projects into user_projects/{uid}")
+    _marker_ref(uid).set(True)
+
+
+def _ensure_backfilled(uid):
+    """Backfill the index once per user, tracked by user_projects_backfilled/<uid>
+
+    The index alone can't tell: a new project may be indexed before the first read.
+    """
+    if uid in _backfilled:
+        return
+    if not _marker_ref(uid).get():
+        _backfill(uid)
+    with _backfilled_lock:
+        _backfilled.add(uid)
+
+
+def get_user_project_ids(uid):
+    """Return the user's project IDs, newest first"""
+    _ensure_backfilled(uid)
+    entries = _index_ref(uid).get() or {}
+    return [project_id for project_id, _ in sorted(entries.items(), key=lambda x: x[1] or '', reverse=True)]
@@ -0,0 +1,45 @@
+import os
+import logging
+from .ttl_cache import TTLCache, MISSING
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds a loaded session user is reused before Firebase is asked again
+USER_SESSION_TTL = float(os.getenv('USER_SESSION_TTL', '300'))
+USER_SESSION_CACHE_SIZE = int(os.getenv('USER_SESSION_CACHE_SIZE', '10000'))
+
+
+class UserSessionCache:
+    """Per-uid cache of the fields Flask-Login needs to rebuild the current user"""
+
+    def __init__(self, ttl=USER_SESSION_TTL, max_size=USER_SESSION_CACHE_SIZE):
+        self._cache = TTLCache(ttl, max_size)
+
+    def load(self, uid, loader):
+        """Return a User for uid, calling loader(uid) only on a cache miss"""
+        from app.models import User
+
+        fields = self._cache.get(uid)
+        if fields is MISSING:
+            user = loader(uid)
+            if user is None:
+                # Unknown users are not cached so a fresh registration logs in right away
+                return None
+            fields = user.to_dict()
+            self._cache.set(uid, fields)
+
+        return User(
+            uid=fields['uid'],
+            email=fields['email'],
+            display_name=fields.get('display_name'),
+            photo_url=fields.get('photo_url')
+        )
+
+    def invalidate(self, uid):
+        """Forget a session user after their profile or wallet changes"""
+        self._cache.pop(uid)
+
+
+# Shared session cache for the current worker process
+user_sessions = UserSessionCache()
@@ -1,11 +1,16 @@
 from web3 import Web3
 from eth_account import Account
-import json
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import logging
+import threading
 from .warning_filters import ignore_web3_warnings, setup_warning_filters
+from .nonce_manager import NonceManager
+from .multicall import Multicall
+from .abi_bundle import load_contract_abi
+from .rpc_provider import PooledHTTPProvider, rpc_urls
+from .ttl_cache import TTLCache, MISSING
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,16 +21,7 @@ setup_warning_filters()
 
 load_dotenv()
 
-# Web3 setup with Avalanche C-Chain
 AVALANCHE_TESTNET_URL = os.getenv('AVALANCHE_TESTNET_URL')
-if not AVALANCHE_TESTNET_URL:
-    raise ValueError("AVALANCHE_TESTNET_URL not found in environment variables")
-
-w3 = Web3(Web3.HTTPProvider(AVALANCHE_TESTNET_URL))
-# Add POA middleware for Avalanche
-from web3.middleware import ExtraDataToPOAMiddleware
-w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-
 CHAIN_ID = int(os.getenv('CHAIN_ID', '43113'))  # Default to Avalanche Testnet
 
 # Contract addresses (using existing values from .env)
@@ -33,60 +29,114 @@ FUNDING_CONTRACT_ADDRESS = os.getenv('FUNDING_CONTRACT_ADDRESS')
 PROJECT_DAO_ADDRESS = os.getenv('PROJECT_DAO_ADDRESS')
 REWARD_TOKEN_ADDRESS = os.getenv('REWARD_TOKEN_ADDRESS')
 
-if not all([FUNDING_CONTRACT_ADDRESS, PROJECT_DAO_ADDRESS, REWARD_TOKEN_ADDRESS]):
-    raise ValueError("One or more contract addresses not found in environment variables")
+# Seconds a contribute() gas estimate is reused for the same value range
+GAS_ESTIMATE_TTL = float(os.getenv('GAS_ESTIMATE_TTL', '60'))
+# Seconds fee data is reused; about one C-Chain block
+FEE_DATA_TTL = float(os.getenv('FEE_DATA_TTL', '2'))
 
-# Platform wallet (using existing private key)
-PRIVATE_KEY = os.getenv('PRIVATE_KEY')
-if not PRIVATE_KEY:
-    raise ValueError("PRIVATE_KEY not found in environment variables")
+_gas_estimates = TTLCache(GAS_ESTIMATE_TTL, 1024)
+_fee_data = TTLCache(FEE_DATA_TTL, 1)
 
-PLATFORM_WALLET = Account.from_key(PRIVATE_KEY)
+def _require_env(name, value):
+    if not value:
+        raise ValueError(f"{name} not found in environment variables")
+    return value
 
-@ignore_web3_warnings
-def load_contract_abi(contract_name):
-    """Load contract ABI from artifacts"""
-    try:
-        abi_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                            'web3', 'artifacts', 'contracts', f'{contract_name}.sol', 
-                            f'{contract_name}.json')
-        with open(abi_path) as f:
-            contract_json = json.load(f)
-            return contract_json['abi']
-    except FileNotFoundError:
-        logger.error(f"Contract ABI not found for {contract_name}")
-        raise
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in contract ABI file for {contract_name}")
-        raise
+class Web3Clients:
+    """Flask extension that connects to the chain and loads contracts the first time they are used"""
+
+    def __init__(self, app=None):
+        self._clients = {}
+        self._lock = threading.RLock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['web3'] = self
+
+    def _get(self, name, factory):
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                if name not in self._clients:
+                    self._clients[name] = factory()
+                client = self._clients[name]
+        return client
+
+    def _connect(self):
+        # Web3 setup with Avalanche C-Chain
+        urls = rpc_urls(AVALANCHE_TESTNET_URL)
+        w3 = Web3(PooledHTTPProvider(_require_env('AVALANCHE_TESTNET_URL', urls)))
+        # Add POA middleware for Avalanche
+        from web3.middleware import ExtraDataToPOAMiddleware
+        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        return w3
+
+    def _contract(self, contract_name, env_name, address):
+        contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(_require_env(env_name, address)),
+            abi=load_contract_abi(contract_name)
+        )
+        logger.info(f"{contract_name} contract loaded successfully")
+        return contract
+
+    @property
+    def w3(self):
+        return self._get('w3', self._connect)
+
+    @property
+    def platform_wallet(self):
+        """Platform wallet (using existing private key)"""
+        return self._get('platform_wallet', lambda: Account.from_key(_require_env('PRIVATE_KEY', os.getenv('PRIVATE_KEY'))))
+
+    @property
+    def funding_contract(self):
+        return self._get('funding_contract', lambda: self._contract(
+            'FundingContract', 'FUNDING_CONTRACT_ADDRESS', FUNDING_CONTRACT_ADDRESS))
+
+    @property
+    def project_dao(self):
+        return self._get('project_dao', lambda: self._contract(
+            'ProjectDAO', 'PROJECT_DAO_ADDRESS', PROJECT_DAO_ADDRESS))
+
+    @property
+    def reward_token(self):
+        return self._get('reward_token', lambda: self._contract(
+            'RewardToken', 'REWARD_TOKEN_ADDRESS', REWARD_TOKEN_ADDRESS))
+
+    @property
+    def platform_nonces(self):
+        """Local nonce allocation so concurrent platform transactions don't race"""
+        return self._get('platform_nonces', lambda: NonceManager(self.w3, self.platform_wallet.address))
+
+    @property
+    def multicall(self):
+        """Batches read-only contract calls into a single eth_call"""
+        return self._get('multicall', lambda: Multicall(self.w3))
 
-# Load contract ABIs
-try:
-    funding_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(FUNDING_CONTRACT_ADDRESS),
-        abi=load_contract_abi('FundingContract')
-    )
-    logger.info("Funding contract loaded successfully")
-
-    project_dao = w3.eth.contract(
-        address=Web3.to_checksum_address(PROJECT_DAO_ADDRESS),
-        abi=load_contract_abi('ProjectDAO')
-    )
-    logger.info("Project DAO contract loaded successfully")
-
-    reward_token = w3.eth.contract(
-        address=Web3.to_checksum_address(REWARD_TOKEN_ADDRESS),
-        abi=load_contract_abi('RewardToken')
-    )
-    logger.info("Reward token contract loaded successfully")
-
-except Exception as e:
-    logger.error(f"Error loading contracts: {str(e)}")
-    raise
+
+# Shared Web3 clients for the current worker process
+web3_clients = Web3Clients()
+
+# Old module-level names, resolved on first access instead of at import
+_LAZY_ATTRIBUTES = {
+    'w3': 'w3',
+    'PLATFORM_WALLET': 'platform_wallet',
+    'funding_contract': 'funding_contract',
+    'project_dao': 'project_dao',
+    'reward_token': 'reward_token',
+    'platform_nonces': 'platform_nonces',
+    'multicall': 'multicall'
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(web3_clients, _LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @ignore_web3_warnings
-def create_project_on_chain(name, description, funding_goal, deadline_days):
-    """Create a project on the blockchain"""
+def submit_project_creation(name, description, funding_goal, deadline_days):
+    """Sign and send a createProject transaction without waiting for it to be mined"""
     try:
         logger.info(f"Creating project: {name} with goal: {funding_goal} AVAX")
         
@@ -97,7 +147,7 @@ def create_project_on_chain(name, description, funding_goal, deadline_days):
         duration_seconds = int(deadline_days * 12 * 60 * 60)  # 12 hours worth of seconds
         
         # Get the function from contract
-        function = funding_contract.functions.createProject(
+        function = web3_clients.funding_contract.functions.createProject(
             name,
             description,
             funding_goal_wei,
@@ -105,37 +155,69 @@ def create_project_on_chain(name, description, funding_goal, deadline_days):
         )
         
         # Estimate gas
-        gas_estimate = function.estimate_gas({'from': PLATFORM_WALLET.address})
+        gas_estimate = function.estimate_gas({'from': web3_clients.platform_wallet.address})
         logger.info(f"Estimated gas: {gas_estimate}")
         
-        # Build transaction
-        transaction = function.build_transaction({
-            'from': PLATFORM_WALLET.address,
-            'gas': gas_estimate,
-            'nonce': w3.eth.get_transaction_count(PLATFORM_WALLET.address),
-            'chainId': CHAIN_ID
-        })
-        
-        # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(transaction, PLATFORM_WALLET.key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        logger.info(f"Transaction sent: {tx_hash.hex()}")
+        def send(nonce):
+            # Build transaction
+            transaction = function.build_transaction({
+                'from': web3_clients.platform_wallet.address,
+                'gas': gas_estimate,
+                'nonce': nonce,
+                'chainId': CHAIN_ID
+            })
+            
+            # Sign and send transaction
+            signed_txn = web3_clients.w3.eth.account.sign_transaction(transaction, web3_clients.platform_wallet.key)
+            tx_hash = web3_clients.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            logger.info(f"Transaction sent: {tx_hash.hex()} (nonce {nonce})")
+            return tx_hash.hex()
         
+        # Retried with a fresh nonce if another worker used ours
+        return web3_clients.platform_nonces.send(send)
+
+    except Exception as e:
+        logger.error(f"Error submitting project creation: {str(e)}")
+        raise
+
+@ignore_web3_warnings
+def wait_for_project_id(tx_hash, timeout=120):
+    """Wait for a createProject transaction and return the ID from its ProjectCreated event"""
+    try:
         # Wait for receipt
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = web3_clients.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
         logger.info(f"Transaction mined in block: {receipt['blockNumber']}")
         
         # Get project ID from event
-        project_created_event = funding_contract.events.ProjectCreated().process_receipt(receipt)
+        project_created_event = web3_clients.funding_contract.events.ProjectCreated().process_receipt(receipt)
         project_id = project_created_event[0]['args']['projectId']
         
         logger.info(f"Project created with ID: {project_id}")
         return project_id
 
+    except Exception as e:
+        logger.error(f"Error waiting for project creation {tx_hash}: {str(e)}")
+        raise
+
+@ignore_web3_warnings
+def create_project_on_chain(name, description, funding_goal, deadline_days):
+    """Create a project on the blockchain"""
+    try:
+        tx_hash = submit_project_creation(name, description, funding_goal, deadline_days)
+        return wait_for_project_id(tx_hash)
+
     except Exception as e:
         logger.error(f"Error creating project on chain: {str(e)}")
         raise
 
+def _value_bucket(value_wei):
+    """Power-of-two bucket of a transaction value, for sharing gas estimates"""
+    return int(value_wei).bit_length()
+
+def _rpc_error(response):
+    error = response.get('error') or {}
+    return error.get('message', str(error))
+
 @ignore_web3_warnings
 def contribute_to_project(project_id, amount, contributor_address):
     """Contribute to a project"""
@@ -148,34 +230,75 @@ def contribute_to_project(project_id, amount, contributor_address):
         # Ensure project_id is an integer
         project_id = int(project_id)
         
-        # Verify project exists and is active
-        project = funding_contract.functions.projects(project_id).call()
-        if not project[7]:  # exists flag
-            raise ValueError(f"Project {project_id} does not exist")
-        if project[6]:  # funded flag
-            raise ValueError(f"Project {project_id} is already fully funded")
-            
         # Convert amount to Wei
         amount_wei = Web3.to_wei(amount, 'ether')
         
         # Get the contribute function
-        function = funding_contract.functions.contribute(project_id)
+        function = web3_clients.funding_contract.functions.contribute(project_id)
+        data = function._encode_transaction_data()
+        project_function = web3_clients.funding_contract.functions.projects(project_id)
         
         # Convert contract address to checksum
         funding_contract_address = Web3.to_checksum_address(FUNDING_CONTRACT_ADDRESS)
         
-        # Estimate gas with the actual value being sent
-        try:
-            gas_estimate = function.estimate_gas({
+        # Project state, nonce, and any stale gas estimate or fee data in one batch
+        gas_key = (data[:10], _value_bucket(amount_wei))
+        gas_estimate = _gas_estimates.get(gas_key)
+        fees = _fee_data.get('latest')
+        calls = [
+            ('eth_call', [{'to': funding_contract_address, 'data': project_function._encode_transaction_data()}, 'latest']),
+            ('eth_getTransactionCount', [contributor_address, 'pending'])
+        ]
+        if gas_estimate is MISSING:
+            calls.append(('eth_estimateGas', [{
                 'from': contributor_address,
-                'value': amount_wei
-            })
-            # Add 20% buffer to gas estimate for safety
-            gas_estimate = int(gas_estimate * 1.2)
-        except Exception as e:
-            logger.error(f"Error estimating gas: {str(e)}")
-            # Use a safe default if estimation fails
-            gas_estimate = 300000
+                'to': funding_contract_address,
+                'value': hex(amount_wei),
+                'data': data
+            }]))
+        if fees is MISSING:
+            calls.append(('eth_getBlockByNumber', ['latest', False]))
+            calls.append(('eth_maxPriorityFeePerGas', []))
+        responses = web3_clients.w3.provider.make_batch(calls)
+        
+        # Verify project exists and is active
+        if 'error' in responses[0]:
+            raise ValueError(f"Could not read project {project_id}: {_rpc_error(responses[0])}")
+        project = web3_clients.w3.codec.decode(
+            [output['type'] for output in project_function.abi['outputs']],
+            bytes.fromhex(responses[0]['result'][2:])
+        )
+        if not project[7]:  # exists flag
+            raise ValueError(f"Project {project_id} does not exist")
+        if project[6]:  # funded flag
+            raise ValueError(f"Project {project_id} is already fully funded")
+        
+        nonce = int(responses[1]['result'], 16)
+        
+        next_response = 2
+        if gas_estimate is MISSING:
+            response = responses[next_response]
+            next_response += 1
+            if 'error' in response:
+                logger.error(f"Error estimating gas: {_rpc_error(response)}")
+                gas_estimate = None
+            else:
+                gas_estimate = int(response['result'], 16)
+                _gas_estimates.set(gas_key, gas_estimate)
+        # Add 20% buffer to gas estimate for safety, or use a safe default if estimation fails
+        gas_estimate = int(gas_estimate * 1.2) if gas_estimate else 300000
+        
+        if fees is MISSING:
+            block, priority = responses[next_response:next_response + 2]
+            fees = {}
+            base_fee = (block.get('result') or {}).get('baseFeePerGas')
+            if base_fee and 'result' in priority:
+                priority_fee = int(priority['result'], 16)
+                fees = {
+                    'maxFeePerGas': 2 * int(base_fee, 16) + priority_fee,
+                    'maxPriorityFeePerGas': priority_fee
+                }
+            _fee_data.set('latest', fees)
         
         # Build transaction
         transaction = {
@@ -183,15 +306,16 @@ def contribute_to_project(project_id, amount, contributor_address):
             'from': contributor_address,
             'value': amount_wei,
             'gas': gas_estimate,
-            'nonce': w3.eth.get_transaction_count(contributor_address),
+            'nonce': nonce,
             'chainId': CHAIN_ID,
-            'data': function._encode_transaction_data()
+            'data': data
         }
+        transaction.update(fees)
         
         logger.info(f"Contribution transaction prepared for project {project_id}")
         logger.info(f"Transaction details: Gas: {gas_estimate}, Value: {amount_wei} wei")
         logger.info(f"Project creator address: {project[2]}")  # Log creator address
-        logger.info(f"Platform fee address: {PLATFORM_WALLET.address}")  # Log platform fee address
+        logger.info(f"Platform fee address: {web3_clients.platform_wallet.address}")  # Log platform fee address
         return transaction
 
     except ValueError as e:
@@ -209,13 +333,13 @@ def create_project_proposal(project_id, description, creator_address):
         project_id = int(project_id)
         
         # Create the proposal call data for the funding contract
-        proposal_data = funding_contract.encodeABI(
+        proposal_data = web3_clients.funding_contract.encodeABI(
             fn_name='createProjectProposal',
             args=[project_id, description]
         )
         
         # Get the propose function from DAO contract
-        function = project_dao.functions.propose(
+        function = web3_clients.project_dao.functions.propose(
             [FUNDING_CONTRACT_ADDRESS],  # targets
             [0],  # values
             [proposal_data],  # calldatas
@@ -230,7 +354,7 @@ def create_project_proposal(project_id, description, creator_address):
         transaction = function.build_transaction({
             'from': creator_address,
             'gas': gas_estimate,
-            'nonce': w3.eth.get_transaction_count(creator_address),
+            'nonce': web3_clients.w3.eth.get_transaction_count(creator_address),
             'chainId': CHAIN_ID
         })
         
@@ -243,27 +367,62 @@ def create_project_proposal(project_id, description, creator_address):
         logger.error(f"Error creating proposal: {str(e)}")
         raise
 
+def _format_project(project):
+    """Convert a raw projects() tuple into a details dict"""
+    return {
+        'name': project[0],
+        'description': project[1],
+        'creator': project[2],
+        'funding_goal': Web3.from_wei(project[3], 'ether'),
+        'current_funding': Web3.from_wei(project[4], 'ether'),
+        'deadline': datetime.fromtimestamp(project[5]),
+        'funded': project[6],
+        'exists': project[7]
+    }
+
 @ignore_web3_warnings
 def get_project_details(project_id):
     """Get project details from the blockchain"""
     try:
         project_id = int(project_id)
-        project = funding_contract.functions.projects(project_id).call()
+        project = web3_clients.funding_contract.functions.projects(project_id).call()
         
-        return {
-            'name': project[0],
-            'description': project[1],
-            'creator': project[2],
-            'funding_goal': Web3.from_wei(project[3], 'ether'),
-            'current_funding': Web3.from_wei(project[4], 'ether'),
-            'deadline': datetime.fromtimestamp(project[5]),
-            'funded': project[6],
-            'exists': project[7]
-        }
+        return _format_project(project)
     except Exception as e:
         logger.error(f"Error getting project details: {str(e)}")
         raise
 
+@ignore_web3_warnings
+def get_projects_state(project_ids):
+    """Get details, votes and contributors for many projects in one multicall round trip"""
+    try:
+        project_ids = [int(project_id) for project_id in project_ids]
+        
+        functions = []
+        for project_id in project_ids:
+            functions.append(web3_clients.funding_contract.functions.projects(project_id))
+            functions.append(web3_clients.funding_contract.functions.getProjectVotes(project_id))
+            functions.append(web3_clients.funding_contract.functions.getContributors(project_id))
+        results = web3_clients.multicall.call(functions)
+        
+        states = {}
+        for index, project_id in enumerate(project_ids):
+            project, votes, contributors = results[index * 3:index * 3 + 3]
+            states[project_id] = {
+                'details': _format_project(project) if project is not None else None,
+                # getProjectVotes reverts for projects without a proposal
+                'votes': {
+                    'against': votes[0],
+                    'for': votes[1],
+                    'abstain': votes[2]
+                } if votes is not None else None,
+                'contributors': list(contributors or [])
+            }
+        return states
+    except Exception as e:
+        logger.error(f"Error getting batched project state: {str(e)}")
+        raise
+
 @ignore_web3_warnings
 def get_platform_fees(amount):
     """Calculate platform fees for a given donation amount"""
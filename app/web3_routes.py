@@ -4,8 +4,6 @@ from .models import db, Project, Proposal, Vote
 from datetime import datetime
 from web3 import Web3
 
-# Initialize Web3 instance
-w3 = Web3(Web3.HTTPProvider('https://api.avax-test.network/ext/bc/C/rpc'))
 web3_bp = Blueprint('web3', __name__)
 
 @web3_bp.route('/update_wallet', methods=['POST'])
@@ -35,7 +33,7 @@ def fund_project(project_id):
         return jsonify({'error': 'No amount provided'}), 400
 
     # Convert AVAX to Wei
-    amount_wei = w3.to_wei(amount, 'ether')
+    amount_wei = Web3.to_wei(amount, 'ether')
         
     project = Project.query.get_or_404(project_id)
     
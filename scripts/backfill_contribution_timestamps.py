@@ -0,0 +1,64 @@
+import os
+import sys
+import logging
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load environment variables
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+from app.utils.firebase_clients import firebase
+from app.utils.records import parse_timestamp
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Firestore rejects batches with more than 500 writes
+BATCH_SIZE = 500
+
+
+def backfill_contribution_timestamps():
+    """Copy created_at into timestamp for contributions written before timestamp existed
+
+    Transaction history orders by timestamp, so rows without it would not be listed.
+    """
+    db = firebase.firestore()
+    batch = db.batch()
+    pending = 0
+    updated = 0
+    skipped = 0
+
+    for doc in db.collection('contributions').select(['created_at', 'timestamp']).stream():
+        data = doc.to_dict()
+        if data.get('timestamp'):
+            continue
+
+        created_at = parse_timestamp(data.get('created_at'))
+        if created_at is None:
+            logger.warning(f"Contribution {doc.id} has no usable created_at, skipping")
+            skipped += 1
+            continue
+
+        batch.update(doc.reference, {'timestamp': created_at.isoformat()})
+        pending += 1
+        updated += 1
+        if pending == BATCH_SIZE:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    if pending:
+        batch.commit()
+    logger.info(f"Backfilled timestamp on {updated} contributions ({skipped} skipped)")
+    return updated
+
+
+if __name__ == "__main__":
+    try:
+        backfill_contribution_timestamps()
+    except Exception as e:
+        logger.error(f"Backfill failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+import logging
+from eth_utils import keccak
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.abi_bundle import ABI_BUNDLE_PATH, artifact_path, abi_signature
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Contracts the backend talks to
+CONTRACTS = ('FundingContract', 'ProjectDAO', 'RewardToken')
+
+def build_entry(contract_name):
+    """Keep only the ABI of a Hardhat artifact and precompute its selectors and event topics"""
+    with open(artifact_path(contract_name)) as f:
+        abi = json.load(f)['abi']
+
+    functions = {}
+    events = {}
+    for item in abi:
+        if item.get('type') == 'function':
+            signature = abi_signature(item)
+            functions[signature] = '0x' + keccak(text=signature)[:4].hex()
+        elif item.get('type') == 'event':
+            signature = abi_signature(item)
+            events[signature] = '0x' + keccak(text=signature).hex()
+
+    return {'abi': abi, 'functions': functions, 'events': events}
+
+def build_bundle(path=ABI_BUNDLE_PATH):
+    """Write the ABI bundle for every backend contract"""
+    bundle = {name: build_entry(name) for name in CONTRACTS}
+    with open(path, 'w') as f:
+        json.dump(bundle, f, separators=(',', ':'), sort_keys=True)
+    logger.info(f"Wrote ABI bundle for {len(bundle)} contracts to {path}")
+
+if __name__ == "__main__":
+    try:
+        build_bundle()
+    except Exception as e:
+        logger.error(f"Building ABI bundle failed: {str(e)}")
+        sys.exit(1)
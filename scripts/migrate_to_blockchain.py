@@ -13,7 +13,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
 
-from app.utils.web3_utils import create_project_on_chain
+from app.utils.web3_utils import submit_project_creation, wait_for_project_id
+from app.utils.chain_jobs import (
+    claim_project,
+    CHAIN_STATUS_PENDING,
+    CHAIN_STATUS_SUBMITTED,
+    CHAIN_STATUS_CONFIRMED
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -71,7 +77,8 @@ def migrate_projects_to_blockchain():
         
         logger.info(f"Found {len(all_projects)} projects to migrate")
         
-        # Process each project
+        # Submit every project first; the nonce manager lets transactions pipeline
+        submitted = []
         for project_id, project_data in all_projects.items():
             try:
                 # Skip if already has blockchain ID
@@ -79,6 +86,16 @@ def migrate_projects_to_blockchain():
                     logger.info(f"Project {project_id} already has blockchain ID: {project_data['blockchain_project_id']}")
                     continue
                 
+                # The chain worker is already sending these
+                if project_data.get('chain_status') in (CHAIN_STATUS_PENDING, CHAIN_STATUS_SUBMITTED):
+                    logger.info(f"Project {project_id} is {project_data['chain_status']} in the chain worker, skipping")
+                    continue
+                
+                # Same claim the chain worker takes, so a project is never sent twice
+                if not claim_project(project_id):
+                    logger.info(f"Project {project_id} is being submitted by another process, skipping")
+                    continue
+                
                 logger.info(f"\nProcessing project: {project_id}")
                 
                 # Clean title and description
@@ -88,25 +105,35 @@ def migrate_projects_to_blockchain():
                 logger.info(f"Title: {title}")
                 
                 # Create project on blockchain with 1 day duration
-                blockchain_project_id = create_project_on_chain(
+                tx_hash = submit_project_creation(
                     name=title,
                     description=description,
                     funding_goal=float(project_data['goal_amount']),
                     deadline_days=1  # Set to 1 day to match contract limit
                 )
+                submitted.append((project_id, tx_hash))
+                
+            except Exception as project_error:
+                logger.error(f"Error processing project {project_id}: {str(project_error)}")
+                continue
+        
+        # Then collect receipts and backfill the blockchain IDs
+        for project_id, tx_hash in submitted:
+            try:
+                blockchain_project_id = wait_for_project_id(tx_hash)
                 
                 logger.info(f"Created on blockchain with ID: {blockchain_project_id}")
                 
                 # Update RTDB
-                rtdb_ref.child(project_id).update({
-                    'blockchain_project_id': int(blockchain_project_id)
-                })
+                chain_fields = {
+                    'blockchain_project_id': int(blockchain_project_id),
+                    'chain_status': CHAIN_STATUS_CONFIRMED
+                }
+                rtdb_ref.child(project_id).update(chain_fields)
                 
                 # Update Firestore
                 firestore_doc = db.collection('projects').document(project_id)
-                firestore_doc.update({
-                    'blockchain_project_id': int(blockchain_project_id)
-                })
+                firestore_doc.update(chain_fields)
                 
                 logger.info(f"Updated databases with blockchain ID for project {project_id}")
                 
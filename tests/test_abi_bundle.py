@@ -0,0 +1,33 @@
+import json
+import unittest
+from app.utils import abi_bundle
+from app.utils.abi_bundle import abi_signature, load_contract_abi, load_event_topics
+
+class TestAbiBundle(unittest.TestCase):
+    def test_signature_with_tuples(self):
+        """Test tuple arguments are expanded in canonical signatures"""
+        item = {
+            'name': 'aggregate3',
+            'inputs': [{
+                'type': 'tuple[]',
+                'components': [{'type': 'address'}, {'type': 'bool'}, {'type': 'bytes'}]
+            }]
+        }
+        self.assertEqual(abi_signature(item), 'aggregate3((address,bool,bytes)[])')
+
+    def test_bundle_matches_artifacts(self):
+        """Test the bundled ABIs are the ones in the Hardhat artifacts"""
+        for contract_name in ('FundingContract', 'ProjectDAO', 'RewardToken'):
+            with open(abi_bundle.artifact_path(contract_name)) as f:
+                self.assertEqual(load_contract_abi(contract_name), json.load(f)['abi'])
+
+    def test_event_topics(self):
+        """Test precomputed event topics map to event names"""
+        topics = load_event_topics('FundingContract')
+        self.assertEqual(
+            topics['0x3fc3b070e9894cd62cadb58d640d5365f025b5d368f467497da53fa9885b5418'],
+            'ContributionMade'
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from app.utils import browsing_history
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, reference, data):
+        self.writes.append(data)
+
+    def commit(self):
+        if self.db.fail:
+            raise RuntimeError('unavailable')
+        self.db.committed.extend(self.writes)
+
+class FakeDocument:
+    def collection(self, name):
+        return FakeCollection()
+
+class FakeCollection:
+    def document(self, *args):
+        return FakeDocument()
+
+class FakeFirestore:
+    def __init__(self):
+        self.fail = False
+        self.committed = []
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def collection(self, name):
+        return FakeCollection()
+
+class FakeClients:
+    def __init__(self, db):
+        self.db = db
+
+    def firestore(self):
+        return self.db
+
+class TestBrowsingHistory(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeFirestore()
+        self.original_firebase = browsing_history.firebase
+        browsing_history.firebase = FakeClients(self.db)
+        # Keep the background writer out of the way
+        browsing_history._thread = object()
+        browsing_history._pending.clear()
+
+    def tearDown(self):
+        browsing_history.firebase = self.original_firebase
+        browsing_history._pending.clear()
+
+    def test_flush_writes_views(self):
+        """Test queued views are written once per user and project"""
+        browsing_history.record_view('u1', 'p1')
+        browsing_history.record_view('u1', 'p1')
+        browsing_history.record_view('u1', 'p2')
+        self.assertEqual(browsing_history.flush(), 2)
+        self.assertEqual(len(self.db.committed), 2)
+
+    def test_failed_commit_requeues(self):
+        """Test views survive a failed commit and are written on the next flush"""
+        browsing_history.record_view('u1', 'p1')
+        self.db.fail = True
+        with self.assertRaises(RuntimeError):
+            browsing_history.flush()
+        self.assertEqual(len(browsing_history._pending), 1)
+
+        self.db.fail = False
+        self.assertEqual(browsing_history.flush(), 1)
+        self.assertEqual(self.db.committed[0]['project_id'], 'p1')
+
+if __name__ == '__main__':
+    unittest.main()
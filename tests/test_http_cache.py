@@ -0,0 +1,51 @@
+import unittest
+from flask import Flask, jsonify
+from app.utils.http_cache import conditional_json
+
+class TestConditionalJson(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.version = 1
+        self.calls = 0
+
+        @self.app.route('/versioned')
+        @conditional_json(version=lambda: self.version)
+        def versioned():
+            self.calls += 1
+            return jsonify({'version': self.version})
+
+        @self.app.route('/hashed')
+        @conditional_json(cache_control='private, no-cache')
+        def hashed():
+            return jsonify({'ok': True})
+
+        self.client = self.app.test_client()
+
+    def test_versioned_not_modified(self):
+        """Test a matching ETag returns 304 without running the view"""
+        first = self.client.get('/versioned')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers['Cache-Control'], 'no-cache')
+        etag = first.headers['ETag']
+
+        second = self.client.get('/versioned', headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+    def test_version_change(self):
+        """Test a version bump changes the ETag"""
+        etag = self.client.get('/versioned').headers['ETag']
+        self.version = 2
+        response = self.client.get('/versioned', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_body_hash(self):
+        """Test views without a version are matched on the body hash"""
+        first = self.client.get('/hashed')
+        self.assertEqual(first.headers['Cache-Control'], 'private, no-cache')
+        second = self.client.get('/hashed', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(second.status_code, 304)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from flask import Flask, jsonify
+from app.utils.json_provider import FastJSONProvider, json_array_response
+
+class TestFastJSONProvider(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+
+        @self.app.route('/record')
+        def record():
+            return jsonify({
+                'created_at': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                'amount': Decimal('1.50')
+            })
+
+        @self.app.route('/donation')
+        def donation():
+            return jsonify({'transaction': {'value': 20 * 10**18}})
+
+        @self.app.route('/stream')
+        def stream():
+            return json_array_response(({'n': n} for n in range(5)), batch_size=2)
+
+        self.client = self.app.test_client()
+
+    def test_datetime_and_decimal(self):
+        """Test datetimes are ISO 8601 and Decimals are strings"""
+        data = json.loads(self.client.get('/record').data)
+        self.assertEqual(data, {'created_at': '2024-01-02T03:04:05+00:00', 'amount': '1.50'})
+
+    def test_wei_sized_integer(self):
+        """Test integers above 64 bits are encoded exactly"""
+        response = self.client.get('/donation')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {'transaction': {'value': 20 * 10**18}})
+
+    def test_streamed_array(self):
+        """Test a streamed array is valid JSON across batch boundaries"""
+        response = self.client.get('/stream')
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(json.loads(response.data), [{'n': n} for n in range(5)])
+
+if __name__ == '__main__':
+    unittest.main()
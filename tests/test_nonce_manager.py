@@ -0,0 +1,95 @@
+import os
+import unittest
+from app.utils.nonce_manager import NonceManager
+
+class FakeEth:
+    def __init__(self, count):
+        self.count = count
+        self.calls = 0
+
+    def get_transaction_count(self, address, block_identifier='latest'):
+        self.calls += 1
+        return self.count
+
+class FakeWeb3:
+    def __init__(self, count):
+        self.eth = FakeEth(count)
+
+class TestNonceManager(unittest.TestCase):
+    def setUp(self):
+        self.w3 = FakeWeb3(7)
+        self.nonces = NonceManager(self.w3, '0xplatform', resync_interval=3600)
+
+    def test_sequential_allocation(self):
+        """Test nonces are allocated locally after one chain read"""
+        self.assertEqual([self.nonces.allocate() for _ in range(3)], [7, 8, 9])
+        self.assertEqual(self.w3.eth.calls, 1)
+
+    def test_release_last_nonce(self):
+        """Test releasing the latest nonce hands it out again"""
+        nonce = self.nonces.allocate()
+        self.nonces.release(nonce)
+        self.assertEqual(self.nonces.allocate(), nonce)
+        self.assertEqual(self.w3.eth.calls, 1)
+
+    def test_release_out_of_order_resyncs(self):
+        """Test a hole in the sequence triggers a resync from the chain"""
+        first = self.nonces.allocate()
+        self.nonces.allocate()
+        self.nonces.release(first)
+        self.w3.eth.count = 8
+        self.assertEqual(self.nonces.allocate(), 8)
+        self.assertEqual(self.w3.eth.calls, 2)
+
+    def test_nonce_error_resyncs(self):
+        """Test a nonce error from the node triggers a resync"""
+        with self.assertRaises(ValueError):
+            with self.nonces.reserve():
+                raise ValueError('nonce too low')
+        self.w3.eth.count = 12
+        self.assertEqual(self.nonces.allocate(), 12)
+
+    def test_send_retries_after_collision(self):
+        """Test a send that lost its nonce to another process is retried with a resynced nonce"""
+        sent = []
+        def send(nonce):
+            sent.append(nonce)
+            if len(sent) == 1:
+                self.w3.eth.count = 8
+                raise ValueError('nonce too low')
+            return '0xhash'
+        self.assertEqual(self.nonces.send(send), '0xhash')
+        self.assertEqual(sent, [7, 8])
+
+    def test_send_gives_up(self):
+        """Test sends stop after the attempt limit and on already known transactions"""
+        def collide(nonce):
+            raise ValueError('nonce too low')
+        with self.assertRaises(ValueError):
+            self.nonces.send(collide, attempts=2)
+
+        calls = []
+        def known(nonce):
+            calls.append(nonce)
+            raise ValueError('already known')
+        with self.assertRaises(ValueError):
+            self.nonces.send(known)
+        self.assertEqual(len(calls), 1)
+
+    def test_gap_detection(self):
+        """Test the counter moves forward when the chain is ahead"""
+        self.nonces.resync_interval = 0
+        with self.nonces.reserve() as nonce:
+            self.assertEqual(nonce, 7)
+        self.w3.eth.count = 20
+        self.assertEqual(self.nonces.allocate(), 20)
+
+    def test_forked_process_resyncs(self):
+        """Test a different process id forces a fresh chain read"""
+        self.nonces.allocate()
+        self.nonces._pid = os.getpid() + 1
+        self.w3.eth.count = 30
+        self.assertEqual(self.nonces.allocate(), 30)
+
+if __name__ == '__main__':
+    unittest.main()
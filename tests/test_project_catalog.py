@@ -0,0 +1,72 @@
+import unittest
+from app.utils.project_catalog import ProjectCatalog
+
+class FakeReference:
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+
+    def get(self):
+        self.reads += 1
+        return {pid: dict(project) for pid, project in self.data.items()}
+
+class RecordingListener:
+    def __init__(self):
+        self.rebuilds = 0
+
+    def rebuild(self, projects):
+        self.rebuilds += 1
+
+    def update(self, project_id, project):
+        pass
+
+class TestProjectCatalog(unittest.TestCase):
+    def setUp(self):
+        self.reference = FakeReference({
+            'p1': {'title': 'Ocean sensors', 'goal_amount': 10.0},
+            'p2': {'title': 'Soil probes', 'goal_amount': 5.0}
+        })
+
+    def make_catalog(self):
+        catalog = ProjectCatalog(ttl=0)
+        catalog._reference = lambda: self.reference
+        return catalog
+
+    def test_version_is_content_derived(self):
+        """Test separate catalogs holding the same data report the same version"""
+        first, second = self.make_catalog(), self.make_catalog()
+        first.ensure_loaded()
+        second.ensure_loaded()
+        self.assertEqual(first.version, second.version)
+
+    def test_unchanged_reload_keeps_version(self):
+        """Test a TTL reload of unchanged data keeps the version and skips listeners"""
+        catalog = self.make_catalog()
+        listener = RecordingListener()
+        catalog.subscribe(listener)
+        catalog.ensure_loaded()
+        version = catalog.version
+
+        catalog.ensure_loaded()
+        self.assertEqual(self.reference.reads, 2)
+        self.assertEqual(catalog.version, version)
+        self.assertEqual(listener.rebuilds, 1)
+
+        self.reference.data['p2']['goal_amount'] = 8.0
+        catalog.ensure_loaded()
+        self.assertNotEqual(catalog.version, version)
+        self.assertEqual(listener.rebuilds, 2)
+
+    def test_patch_matches_reload(self):
+        """Test patching a project gives the version a reload of the same data would"""
+        catalog = self.make_catalog()
+        catalog.ensure_loaded()
+        catalog.patch('p1', {'goal_amount': 12.0})
+
+        self.reference.data['p1']['goal_amount'] = 12.0
+        fresh = self.make_catalog()
+        fresh.ensure_loaded()
+        self.assertEqual(catalog.version, fresh.version)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from app.utils.project_summaries import ProjectSummaries, summarize
+
+class FakeReference:
+    def __init__(self, data=None):
+        self.data = data or {}
+        self.updates = []
+
+    def get(self):
+        return dict(self.data)
+
+    def update(self, values):
+        self.updates.append(values)
+        for key, value in values.items():
+            if value is None:
+                self.data.pop(key, None)
+            else:
+                self.data[key] = value
+
+class TestProjectSummaries(unittest.TestCase):
+    def setUp(self):
+        self.project = {
+            'title': 'Ocean sensors',
+            'description': 'x' * 500,
+            'citations': 'long citations',
+            'documents': [{'name': 'paper.pdf', 'url': 'https://example.com'}],
+            'goal_amount': 10.0,
+            'funds_raised': 2.5,
+            'status': 'active',
+            'created_at': '2024-01-01T00:00:00+00:00',
+            'created_by': 'u1',
+            'creator_name': 'Ada'
+        }
+
+    def test_summarize_keeps_card_fields(self):
+        """Test summaries drop heavy fields and truncate the description"""
+        summary = summarize(dict(self.project, id='p1'))
+        self.assertNotIn('citations', summary)
+        self.assertNotIn('documents', summary)
+        self.assertEqual(len(summary['description']), 200)
+        self.assertEqual(summary['id'], 'p1')
+
+    def test_rebuild_writes_only_changes(self):
+        """Test a rebuild only writes new, changed and removed summaries"""
+        reference = FakeReference({'p1': summarize(self.project), 'gone': {'title': 'Old'}})
+        summaries = ProjectSummaries()
+        summaries._reference = lambda: reference
+
+        changed = dict(self.project, funds_raised=5.0)
+        summaries.rebuild({'p1': self.project, 'p2': changed})
+        summaries.join()
+        self.assertEqual(set(reference.updates[0]), {'p2', 'gone'})
+
+        summaries.rebuild({'p1': self.project, 'p2': changed})
+        summaries.join()
+        self.assertEqual(len(reference.updates), 1)
+
+    def test_hooks_do_not_write_inline(self):
+        """Test catalog hooks return before the RTDB write happens"""
+        reference = FakeReference()
+        summaries = ProjectSummaries()
+        summaries._reference = lambda: reference
+        summaries._lock.acquire()
+        try:
+            summaries.rebuild({'p1': self.project})
+            self.assertEqual(reference.updates, [])
+        finally:
+            summaries._lock.release()
+        summaries.join()
+        self.assertEqual(set(reference.updates[0]), {'p1'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from datetime import datetime, timezone
+from app.utils.records import ProjectRecord, parse_timestamp
+
+class TestRecords(unittest.TestCase):
+    def test_parse_timestamp(self):
+        """Test ISO strings become timezone-aware datetimes"""
+        expected = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        self.assertEqual(parse_timestamp('2024-01-02T03:04:05+00:00'), expected)
+        self.assertEqual(parse_timestamp('2024-01-02T03:04:05Z'), expected)
+        # Naive values were written with utcnow()
+        self.assertEqual(parse_timestamp('2024-01-02T03:04:05'), expected)
+        self.assertIsNone(parse_timestamp('not a date'))
+        self.assertIsNone(parse_timestamp(None))
+
+    def test_project_record(self):
+        """Test records keep their strings and expose parsed values and sort keys"""
+        record = ProjectRecord({'title': 'A', 'created_at': '2024-01-02T03:04:05+00:00'})
+        self.assertEqual(record['created_at'], '2024-01-02T03:04:05+00:00')
+        self.assertEqual(record.created_ts, record.created_at_dt.timestamp())
+        self.assertIsNone(record.deadline_dt)
+
+        copy = record.copy()
+        copy['title'] = 'B'
+        self.assertEqual(record['title'], 'A')
+        self.assertEqual(copy.created_ts, record.created_ts)
+        self.assertIsInstance(copy.with_datetimes()['created_at'], datetime)
+
+if __name__ == '__main__':
+    unittest.main()
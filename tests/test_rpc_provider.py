@@ -0,0 +1,76 @@
+import json
+import unittest
+import requests
+from app.utils.rpc_provider import PooledHTTPProvider
+
+class FakeResponse:
+    def __init__(self, result, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps({'jsonrpc': '2.0', 'id': 0, 'result': result}).encode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = []
+
+    def post(self, uri, data=None, timeout=None):
+        self.calls.append(uri)
+        outcome = self.outcomes[uri].pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+class TestPooledHTTPProvider(unittest.TestCase):
+    def make_provider(self, outcomes):
+        provider = PooledHTTPProvider(list(outcomes), retries=2, backoff=0)
+        provider.session = FakeSession(outcomes)
+        return provider
+
+    def test_failover_on_connection_error(self):
+        """Test an unreachable node fails over to the next one and stays there"""
+        provider = self.make_provider({
+            'https://a': [requests.ConnectionError('down')],
+            'https://b': [FakeResponse('0x1'), FakeResponse('0x2')]
+        })
+        self.assertEqual(provider.make_request('eth_blockNumber', [])['result'], '0x1')
+        self.assertEqual(provider.make_request('eth_blockNumber', [])['result'], '0x2')
+        self.assertEqual(provider.session.calls, ['https://a', 'https://b', 'https://b'])
+
+    def test_reads_retry_on_server_error(self):
+        """Test idempotent reads are retried after a 503"""
+        provider = self.make_provider({
+            'https://a': [FakeResponse(None, 503), FakeResponse('0x5')]
+        })
+        self.assertEqual(provider.make_request('eth_call', [{}, 'latest'])['result'], '0x5')
+
+    def test_writes_not_retried_on_timeout(self):
+        """Test a timed out transaction send is not sent again"""
+        provider = self.make_provider({
+            'https://a': [requests.ReadTimeout('slow')],
+            'https://b': [FakeResponse('0xhash')]
+        })
+        with self.assertRaises(requests.Timeout):
+            provider.make_request('eth_sendRawTransaction', ['0x00'])
+        self.assertEqual(provider.session.calls, ['https://a'])
+
+    def test_batch_responses_in_call_order(self):
+        """Test batch responses are matched to calls by id"""
+        provider = self.make_provider({'https://a': []})
+        response = FakeResponse(None)
+        response.content = json.dumps([
+            {'jsonrpc': '2.0', 'id': 1, 'result': '0x2'},
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x1'}
+        ]).encode()
+        provider.session.outcomes['https://a'].append(response)
+        provider.encode_rpc_request = lambda method, params, ids=iter(range(2)): json.dumps(
+            {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': next(ids)}).encode()
+
+        results = provider.make_batch([('eth_blockNumber', []), ('eth_chainId', [])])
+        self.assertEqual([result['result'] for result in results], ['0x1', '0x2'])
+
+if __name__ == '__main__':
+    unittest.main()
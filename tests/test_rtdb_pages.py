@@ -0,0 +1,49 @@
+import unittest
+from app.utils.rtdb_pages import cursor_page
+
+class FakeQuery:
+    def __init__(self, children):
+        self.children = children
+        self.start = None
+        self.limit = None
+
+    def order_by_key(self):
+        return self
+
+    def start_at(self, key):
+        self.start = key
+        return self
+
+    def limit_to_first(self, limit):
+        self.limit = limit
+        return self
+
+    def get(self):
+        keys = sorted(key for key in self.children if self.start is None or key >= self.start)
+        return {key: self.children[key] for key in keys[:self.limit]}
+
+class TestCursorPage(unittest.TestCase):
+    def setUp(self):
+        self.children = {f'p{n}': {'n': n} for n in range(5)}
+
+    def page(self, after=None):
+        return cursor_page(FakeQuery(self.children), lambda key, data: dict(data, id=key), after=after, limit=2)
+
+    def test_walks_all_pages(self):
+        """Test following next_cursor visits every child once"""
+        seen = []
+        rows, cursor = self.page()
+        seen.extend(rows)
+        while cursor:
+            rows, cursor = self.page(cursor)
+            seen.extend(rows)
+        self.assertEqual([row['id'] for row in seen], sorted(self.children))
+
+    def test_skips_empty_children(self):
+        """Test non-dict children are left out of a page"""
+        self.children['p1'] = None
+        rows, _ = self.page()
+        self.assertEqual([row['id'] for row in rows], ['p0', 'p2'])
+
+if __name__ == '__main__':
+    unittest.main()
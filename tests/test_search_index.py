@@ -0,0 +1,72 @@
+import unittest
+from app.utils.search_index import ProjectSearchIndex, tokenize
+
+class TestProjectSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ProjectSearchIndex()
+        self.index.rebuild({
+            'p1': {
+                'title': 'Quantum Computing Research',
+                'description': 'Error correction for <b>qubits</b>',
+                'citations': 'Shor 1995',
+                'status': 'active',
+                'goal_amount': 10.0
+            },
+            'p2': {
+                'title': 'Marine Biology',
+                'description': 'Coral reef monitoring with quantum sensors',
+                'citations': '',
+                'status': 'inactive',
+                'goal_amount': 50.0
+            },
+            'p3': {
+                'title': 'Soil Microbes',
+                'description': 'Nitrogen fixing bacteria',
+                'citations': 'Smith 2020',
+                'status': 'active',
+                'goal_amount': 120.0
+            }
+        })
+
+    def test_tokenize(self):
+        """Test tokenization strips tags and lowercases"""
+        self.assertEqual(tokenize('<p>Hello, World 42</p>'), ['hello', 'world', '42'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_ranked_search(self):
+        """Test title hits rank above description hits"""
+        self.assertEqual(self.index.search('quantum'), ['p1', 'p2'])
+
+    def test_prefix_search(self):
+        """Test the last query term matches as a prefix"""
+        self.assertEqual(self.index.search('coral re'), ['p2'])
+        self.assertEqual(self.index.search('micro'), ['p3'])
+        self.assertEqual(self.index.search('micro', prefix=False), [])
+
+    def test_citation_search(self):
+        """Test citations are indexed"""
+        self.assertEqual(self.index.search('shor'), ['p1'])
+
+    def test_filters(self):
+        """Test status and goal range filters"""
+        self.assertEqual(self.index.search('quantum', status='active'), ['p1'])
+        self.assertEqual(self.index.search('', min_goal=20, max_goal=120), ['p2', 'p3'])
+        self.assertEqual(self.index.search('', status='active', max_goal=50), ['p1'])
+
+    def test_incremental_update(self):
+        """Test projects can be re-indexed and removed"""
+        self.index.update('p3', {
+            'title': 'Quantum Soil',
+            'description': '',
+            'status': 'active',
+            'goal_amount': 5.0
+        })
+        self.assertEqual(self.index.search('quantum', status='active'), ['p1', 'p3'])
+        self.assertEqual(self.index.search('microbes'), [])
+
+        self.index.update('p1', None)
+        self.assertEqual(self.index.search('qubits'), [])
+        self.assertEqual(len(self.index), 2)
+
+if __name__ == '__main__':
+    unittest.main()